@@ -0,0 +1,137 @@
+import re
+
+import numpy as np
+from scipy import sparse
+
+NGRAM_RANGE = (2, 4)
+DEFAULT_THRESHOLD = 0.5
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(text):
+    return _WHITESPACE_RE.sub(" ", (text or "").lower()).strip()
+
+
+def _char_ngrams(text, ngram_range=NGRAM_RANGE):
+    padded = f" {text} "
+    low, high = ngram_range
+    for n in range(low, high + 1):
+        for i in range(len(padded) - n + 1):
+            yield padded[i:i + n]
+
+
+class CategoryResolver:
+    """تطبیق دسته‌ای نام دسته‌بندی‌ها با TF-IDF روی n-gram های کاراکتری"""
+
+    def __init__(self, categories=None, threshold=DEFAULT_THRESHOLD, ngram_range=NGRAM_RANGE):
+        self.threshold = threshold
+        self.ngram_range = ngram_range
+        self.titles = []
+        self.ids = []
+        self._exact = {}
+        self._vocabulary = {}
+        self._idf = None
+        self._matrix = None
+        if categories:
+            self.fit(categories)
+
+    def fit(self, categories):
+        """ساخت ماتریس TF-IDF برای همه‌ی عنوان‌های TblContentCategory (یک بار)"""
+        self.titles = list(categories.keys())
+        self.ids = [categories[title] for title in self.titles]
+        self._exact = {_normalize(title): i for i, title in enumerate(self.titles)}
+
+        vocabulary = {}
+        rows, cols = [], []
+        for row, title in enumerate(self.titles):
+            for gram in set(_char_ngrams(_normalize(title), self.ngram_range)):
+                rows.append(row)
+                cols.append(vocabulary.setdefault(gram, len(vocabulary)))
+        self._vocabulary = vocabulary
+
+        n_docs = len(self.titles)
+        df = np.bincount(np.asarray(cols, dtype=np.int64), minlength=len(vocabulary))
+        self._idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+        self._matrix = self._vectorize(_normalize(title) for title in self.titles)
+
+    def add(self, title, category_id):
+        """اضافه کردن دسته‌بندی جدید؛ ماتریس در فراخوانی بعدی دوباره ساخته می‌شود"""
+        self.titles.append(title)
+        self.ids.append(category_id)
+        self._exact[_normalize(title)] = len(self.titles) - 1
+        self._matrix = None
+
+    def exact_match(self, title):
+        """عنوان موجود با همان نام نرمال شده، بدون ساختن دوباره‌ی ماتریس"""
+        index = self._exact.get(_normalize(title))
+        return self.titles[index] if index is not None else None
+
+    def _vectorize(self, texts):
+        rows, cols, data = [], [], []
+        unknown_norms = []
+        for row, text in enumerate(texts):
+            counts = {}
+            unknown = {}
+            for gram in _char_ngrams(text, self.ngram_range):
+                col = self._vocabulary.get(gram)
+                if col is not None:
+                    counts[col] = counts.get(col, 0) + 1
+                else:
+                    unknown[gram] = unknown.get(gram, 0) + 1
+            rows.extend([row] * len(counts))
+            cols.extend(counts.keys())
+            data.extend(counts.values())
+            unknown_norms.append(sum(count * count for count in unknown.values()))
+
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), (rows, cols)),
+            shape=(len(unknown_norms), len(self._vocabulary)),
+        )
+        matrix = matrix.multiply(self._idf).tocsr()
+        # n-gram هایی که در هیچ عنوانی نیستند با بیشترین IDF در نرم شمرده می‌شوند،
+        # تا پیش‌بینی‌ای که فقط شامل یک عنوان موجود است امتیاز نزدیک به 1 نگیرد
+        unseen_idf = np.log(1 + len(self.titles)) + 1.0
+        squared_norms = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+        squared_norms += np.asarray(unknown_norms, dtype=np.float64) * unseen_idf ** 2
+        norms = np.sqrt(squared_norms)
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms).dot(matrix).tocsr()
+
+    def resolve_batch(self, category_titles):
+        """
+        امتیازدهی همه‌ی دسته‌بندی‌های پیش‌بینی شده با یک ضرب ماتریسی.
+        خروجی: لیستی از (عنوان دسته‌بندی موجود یا None، امتیاز شباهت)
+        """
+        results = [None] * len(category_titles)
+        pending = []
+        for i, title in enumerate(category_titles):
+            index = self._exact.get(_normalize(title))
+            if index is not None:
+                results[i] = (self.titles[index], 1.0)
+            else:
+                pending.append(i)
+
+        if not pending:
+            return results
+        if not self.titles:
+            for i in pending:
+                results[i] = (None, 0.0)
+            return results
+        if self._matrix is None:
+            self.fit(dict(zip(self.titles, self.ids)))
+
+        queries = self._vectorize(_normalize(category_titles[i]) for i in pending)
+        scores = queries.dot(self._matrix.T).toarray()
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(pending)), best]
+
+        for i, index, score in zip(pending, best, best_scores):
+            if score >= self.threshold:
+                results[i] = (self.titles[index], float(score))
+            else:
+                results[i] = (None, float(score))
+        return results
+
+    def resolve(self, category_title):
+        return self.resolve_batch([category_title])[0]
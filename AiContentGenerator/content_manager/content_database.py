@@ -41,6 +41,46 @@ class ContentDatabase:
         query = "SELECT Id, Title FROM dbo.TblContentCategory"
         return self.db.select(query)
 
+    def get_category_version(self, known_max_id=0):
+        """
+        نسخه‌ی جدول دسته‌بندی‌ها: (MAX(Id)، COUNT(*)، checksum همه‌ی سطرها، checksum سطرهای Id <= known_max_id).
+        checksum روی (Id, Title) است تا تغییر نام یک دسته‌بندی هم دیده شود.
+        """
+        query = """
+            SELECT ISNULL(MAX(Id), 0), COUNT(*),
+                   ISNULL(CHECKSUM_AGG(BINARY_CHECKSUM(Id, Title)), 0),
+                   ISNULL(CHECKSUM_AGG(CASE WHEN Id <= ? THEN BINARY_CHECKSUM(Id, Title) END), 0)
+            FROM dbo.TblContentCategory
+        """
+        max_id, count, checksum, known_checksum = self.db.select(query, (known_max_id,))[0]
+        return int(max_id), int(count), int(checksum), int(known_checksum)
+
+    def get_categories_since(self, last_id):
+        query = "SELECT Id, Title FROM dbo.TblContentCategory WHERE Id > ?"
+        return self.db.select(query, (last_id,))
+
+    def insert_category(self, title):
+        query = "INSERT INTO dbo.TblContentCategory (Title) VALUES (?)"
+        return self.db.insert_and_get_id(query, (title,))
+
+    def get_or_create_category(self, title):
+        """برگرداندن شناسه‌ی دسته‌بندی و ساخت آن در صورت نبود (امن برای اجرای همزمان)"""
+        query = """
+            SET NOCOUNT ON;
+            DECLARE @Id INT;
+            SELECT @Id = Id
+            FROM dbo.TblContentCategory WITH (UPDLOCK, HOLDLOCK)
+            WHERE Title = ?;
+            IF @Id IS NULL
+            BEGIN
+                INSERT INTO dbo.TblContentCategory (Title) VALUES (?);
+                SET @Id = SCOPE_IDENTITY();
+            END
+            SELECT @Id;
+        """
+        row = self.db.fetch_one_and_commit(query, (title, title))
+        return int(row[0]) if row else None
+
     def update_pure_content(self, content_id, title=None, description=None, content_category_id=None):
         update_query = '''
             UPDATE dbo.TblPureContent
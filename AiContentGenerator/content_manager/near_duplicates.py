@@ -0,0 +1,197 @@
+import hashlib
+import os
+import re
+import sqlite3
+import zlib
+
+import numpy as np
+
+DEFAULT_INDEX_PATH = os.path.join("output", ".cache", "near_duplicates.sqlite")
+NUM_PERMUTATIONS = 128
+# 16 باند 8 سطری: آستانه‌ی تقریبی LSH حدود 0.7 شباهت Jaccard
+NUM_BANDS = 16
+SIMILARITY_THRESHOLD = 0.8
+SHINGLE_SIZE = 3
+SEED = 1
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def _permutations(num_permutations=NUM_PERMUTATIONS, seed=SEED):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, size=num_permutations, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=num_permutations, dtype=np.uint64)
+    return a, b
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    words = _WORD_RE.findall((text or "").lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def text_hash(text):
+    return hashlib.blake2b((text or "").encode("utf-8"), digest_size=16).hexdigest()
+
+
+class MinHashLSHIndex:
+    """
+    ایندکس MinHash/LSH توضیحات TblPureContent (SQLite) برای پیدا کردن محتوای تقریباً تکراری.
+    امضای هر سطر فقط وقتی متنش تغییر کند دوباره محاسبه می‌شود.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, threshold=SIMILARITY_THRESHOLD,
+                 num_permutations=NUM_PERMUTATIONS, bands=NUM_BANDS):
+        self.path = path
+        self.threshold = threshold
+        self.num_permutations = num_permutations
+        self.bands = bands
+        self.rows_per_band = num_permutations // bands
+        self._a, self._b = _permutations(num_permutations)
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                content_id INTEGER PRIMARY KEY,
+                text_hash TEXT NOT NULL,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                bucket BLOB NOT NULL,
+                content_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_buckets_key ON buckets (band, bucket);
+            CREATE INDEX IF NOT EXISTS idx_buckets_content ON buckets (content_id);
+        """)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def signature(self, text):
+        """امضای MinHash با num_permutations تابع hash ضرب-شیفت روی shingle های کلمه‌ای"""
+        items = shingles(text)
+        if not items:
+            return None
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in items), dtype=np.uint64, count=len(items))
+        values = (hashes[:, None] * self._a + self._b) >> np.uint64(32)
+        return values.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        for band, rows in enumerate(signature.reshape(self.bands, self.rows_per_band)):
+            yield band, hashlib.blake2b(rows.tobytes(), digest_size=8).digest()
+
+    def update(self, rows, prune=False):
+        """
+        rows: (شناسه، متن). فقط سطرهای جدید یا تغییر کرده دوباره امضا می‌شوند.
+        با prune=True سطرهایی که دیگر وجود ندارند حذف می‌شوند. خروجی: تعداد سطرهای به‌روز شده
+        """
+        known = dict(self.connection.execute("SELECT content_id, text_hash FROM signatures"))
+        seen = set()
+        changed = 0
+        for content_id, text in rows:
+            content_id = int(content_id)
+            seen.add(content_id)
+            digest = text_hash(text)
+            if known.get(content_id) == digest:
+                continue
+            self._delete(content_id)
+            signature = self.signature(text)
+            # متن خالی یا NULL با امضای خالی (بدون bucket) ذخیره می‌شود تا در اجرای بعد دوباره امضا نشود
+            self.connection.execute(
+                "INSERT INTO signatures (content_id, text_hash, signature) VALUES (?, ?, ?)",
+                (content_id, digest, b"" if signature is None else signature.tobytes())
+            )
+            if signature is not None:
+                self.connection.executemany(
+                    "INSERT INTO buckets (band, bucket, content_id) VALUES (?, ?, ?)",
+                    [(band, key, content_id) for band, key in self._band_keys(signature)]
+                )
+            changed += 1
+        if prune:
+            for content_id in set(known) - seen:
+                self._delete(content_id)
+        self.connection.commit()
+        return changed
+
+    def _delete(self, content_id):
+        self.connection.execute("DELETE FROM signatures WHERE content_id = ?", (content_id,))
+        self.connection.execute("DELETE FROM buckets WHERE content_id = ?", (content_id,))
+
+    def _signatures(self, content_ids):
+        """{شناسه: بایت‌های امضا}"""
+        signatures = {}
+        ids = list(content_ids)
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            signatures.update(self.connection.execute(
+                f"SELECT content_id, signature FROM signatures WHERE content_id IN ({placeholders})", chunk
+            ))
+        return signatures
+
+    def clusters(self):
+        """خوشه‌های محتوای تقریباً تکراری (هر خوشه لیست مرتب شناسه‌ها، حداقل دو عضو)"""
+        candidates = [
+            [int(content_id) for content_id in members.split(",")]
+            for members, in self.connection.execute("""
+                SELECT GROUP_CONCAT(content_id) FROM buckets
+                GROUP BY band, bucket HAVING COUNT(*) > 1
+            """)
+        ]
+        blobs = self._signatures({content_id for group in candidates for content_id in group})
+
+        parent = {}
+
+        def find(x):
+            while parent.get(x, x) != x:
+                parent[x] = parent.get(parent[x], parent[x])
+                x = parent[x]
+            return x
+
+        def union(a, b):
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        # سطرهای با امضای یکسان بدون مقایسه در یک خوشه قرار می‌گیرند و فقط یک نماینده‌شان مقایسه می‌شود
+        canonical = {}
+        for content_id in sorted(blobs):
+            first = canonical.setdefault(blobs[content_id], content_id)
+            if first != content_id:
+                union(first, content_id)
+        signatures = {blob: np.frombuffer(blob, dtype=np.uint32) for blob in canonical}
+
+        for group in candidates:
+            distinct = sorted({canonical[blobs[content_id]] for content_id in group})
+            if len(distinct) < 2:
+                continue
+            # هر عضو فقط با نماینده‌ی باکت مقایسه می‌شود، و عضوهایی که قبلاً به آن پیوسته‌اند کنار می‌روند
+            representative = distinct[0]
+            root = find(representative)
+            others = [content_id for content_id in distinct[1:] if find(content_id) != root]
+            if not others:
+                continue
+            matrix = np.stack([signatures[blobs[content_id]] for content_id in others])
+            similarity = (matrix == signatures[blobs[representative]]).mean(axis=1)
+            for content_id, score in zip(others, similarity):
+                if score >= self.threshold:
+                    union(representative, content_id)
+
+        members = {}
+        for content_id in parent:
+            members.setdefault(find(content_id), set()).add(content_id)
+        for root, group in members.items():
+            group.add(root)
+        return sorted(sorted(group) for group in members.values() if len(group) > 1)
+
+    def representatives(self):
+        """{شناسه: شناسه‌ی نماینده‌ی خوشه (کوچک‌ترین شناسه)} فقط برای اعضای غیر نماینده"""
+        return {
+            content_id: cluster[0]
+            for cluster in self.clusters()
+            for content_id in cluster[1:]
+        }
@@ -57,6 +57,25 @@ class SQLServerDatabase:
         result = self.select(query)
         return result[0][0] if result else None
 
+    def fetch_one_and_commit(self, query, params=None):
+        """اجرای کوئری در یک تراکنش، بازگشت اولین سطر و commit"""
+        if not self.connection or self.connection.closed:
+            print("❗ Cannot execute query, connection is closed.")
+            return None
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, params or [])
+            row = cursor.fetchone()
+            self.connection.commit()
+            return row
+        except Exception as e:
+            print(f"Failed to execute query: {e}")
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
     def update(self, query, params=None):
         """اجرای کوئری UPDATE"""
         self._execute_query(query, params=params)
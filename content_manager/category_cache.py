@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+import time
+
+DEFAULT_CACHE_PATH = os.path.join("output", ".cache", "categories.json")
+DEFAULT_TTL = 300
+
+
+class CategoryCache:
+    """
+    کش جدول TblContentCategory که بین workerها و اجراهای مختلف (از طریق فایل) مشترک است.
+    بعد از پایان TTL فقط نسخه‌ی جدول (MAX(Id)، COUNT(*) و checksum عنوان‌ها) بررسی می‌شود؛
+    اگر فقط سطر جدید اضافه شده باشد همان سطرها خوانده می‌شوند و در غیر این صورت (مثلاً تغییر نام) کل جدول.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._state = None
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, state):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _is_fresh(self, state):
+        return state is not None and time.time() - state.get("checked_at", 0) < self.ttl
+
+    def load(self, db):
+        """بازگشت دیکشنری {عنوان: شناسه} با کمترین خواندن ممکن از دیتابیس"""
+        state = self._state
+        if not self._is_fresh(state):
+            state = self._read() or state
+
+        if not self._is_fresh(state):
+            max_id, count, checksum, known_checksum = db.get_category_version(state["max_id"] if state else 0)
+            if state and (state["max_id"], state["count"], state.get("checksum")) == (max_id, count, checksum):
+                pass
+            elif state and max_id > state["max_id"] and state.get("checksum") == known_checksum:
+                categories = dict(state["categories"])
+                for cid, title in db.get_categories_since(state["max_id"]):
+                    categories[title] = cid
+                if len(set(categories.values())) == count:
+                    state = {"categories": categories}
+                else:
+                    state = None
+            else:
+                state = None
+
+            if state is None:
+                state = {"categories": {title: cid for cid, title in db.get_category()}}
+            state.update(max_id=max_id, count=count, checksum=checksum, checked_at=time.time())
+            self._write(state)
+
+        self._state = state
+        return dict(state["categories"])
+
+    def add(self, title, category_id):
+        """
+        ثبت دسته‌بندی تازه ساخته شده در کش محلی و فایل مشترک.
+        max_id/count/checksum دست نمی‌خورند تا بررسی بعدی آن را مثل بقیه‌ی سطرهای جدید بخواند و checksum را تازه کند.
+        """
+        state = self._read() or self._state
+        if state is None:
+            return
+        state["categories"][title] = int(category_id)
+        self._state = state
+        self._write(state)
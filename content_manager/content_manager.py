@@ -1,19 +1,26 @@
 import json
-from difflib import get_close_matches
+from content_manager.category_cache import CategoryCache
+from content_manager.category_resolver import CategoryResolver
 from content_manager.llm_service import QService
+from content_manager.near_duplicates import MinHashLSHIndex
 from content_manager.sql_server_database import SQLServerDatabase
 
 MAX_TITLE_LENGTH = 100
 DEFAULT_TITLE = "Untitled Content"
+CATEGORY_MATCH_THRESHOLD = 0.5
+COMPLETION_BATCH_SIZE = 20
 
 class ContentManager:
-    def __init__(self, session_hash, db_instance):
+    def __init__(self, session_hash, db_instance, category_cache=None):
         self.q_service = QService(session_hash)
         self.db = db_instance
         self.categories = {}
+        self.category_cache = category_cache or CategoryCache()
+        self.category_resolver = CategoryResolver(threshold=CATEGORY_MATCH_THRESHOLD)
 
     def fetch_categories(self):
-        self.categories = {title: cid for cid, title in self.db.get_category()}
+        self.categories = self.category_cache.load(self.db)
+        self.category_resolver.fit(self.categories)
 
     def title_generator_prompt(self, description):
         return f"""
@@ -106,22 +113,13 @@ Requirements:
             return None
 
     def find_best_category_match(self, target_category):
-        target_lower = target_category.lower().strip()
-        available_categories = [cat.lower() for cat in self.categories.keys()]
-        original_case_map = {cat.lower(): cat for cat in self.categories.keys()}
+        return self.resolve_categories([target_category])[0]
 
-        if target_lower in available_categories:
-            return original_case_map[target_lower]
+    def resolve_categories(self, category_titles):
+        """تطبیق دسته‌ای دسته‌بندی‌های پیشنهادی مدل با دسته‌بندی‌های موجود"""
+        return [title for title, _ in self.category_resolver.resolve_batch(category_titles)]
 
-        matches = get_close_matches(target_lower, available_categories, n=3, cutoff=0.4)
-        partial_matches = [cat for cat in available_categories if target_lower in cat or cat in target_lower]
-        unique_matches = list(dict.fromkeys(matches + partial_matches))
-
-        if unique_matches:
-            return original_case_map[unique_matches[0]]
-        return None
-
-    def complete_missing_fields(self, content_id, title=None, description=None):
+    def request_completion(self, content_id, title=None, description=None):
         print(f"\n🔄 Completing missing fields for content ID {content_id}...")
         prompt = self.complete_prompt(title=title, description=description)
 
@@ -131,16 +129,32 @@ Requirements:
 
         if result and isinstance(result, tuple):
             title_out, description_out, category_title = result
-
             if not title:
                 title_out = title_out[:MAX_TITLE_LENGTH]
+            return content_id, title_out, description_out, category_title
 
-            best_match = self.find_best_category_match(category_title)
+        print(f"❌ Could not update content ID {content_id}.")
+        return None
+
+    def apply_completions(self, completions):
+        """ثبت یک دسته از نتایج مدل؛ دسته‌بندی‌ها با یک ضرب ماتریسی تطبیق داده می‌شوند"""
+        completions = [c for c in completions if c]
+        if not completions:
+            return
+
+        matches = self.resolve_categories([category for _, _, _, category in completions])
+        for (content_id, title_out, description_out, category_title), best_match in zip(completions, matches):
+            # ممکن است همین دسته‌بندی در همین دسته کمی قبل‌تر ساخته شده باشد
+            best_match = best_match or self.category_resolver.exact_match(category_title)
             if best_match:
                 category_id = self.categories[best_match]
+            elif not category_title:
+                category_id = None
             else:
-                category_id = self.db.insert_category(category_title)
+                category_id = self.db.get_or_create_category(category_title)
                 self.categories[category_title] = category_id
+                self.category_resolver.add(category_title, category_id)
+                self.category_cache.add(category_title, category_id)
 
             self.db.update_pure_content(
                 content_id,
@@ -149,37 +163,72 @@ Requirements:
                 content_category_id=category_id
             )
             print(f"✅ Content ID {content_id} updated.")
-        else:
-            print(f"❌ Could not update content ID {content_id}.")
+
+    def complete_missing_fields(self, content_id, title=None, description=None):
+        self.apply_completions([self.request_completion(content_id, title=title, description=description)])
+
+    def group_near_duplicates(self, rows):
+        """
+        گروه‌بندی (شناسه، توضیحات) های تقریباً تکراری با MinHash/LSH.
+        خروجی: {شناسه‌ی نماینده: [(شناسه، توضیحات) اعضای دیگر خوشه]}
+        """
+        index = MinHashLSHIndex(":memory:")
+        try:
+            index.update(rows)
+            representatives = index.representatives()
+        finally:
+            index.close()
+        followers = {}
+        for content_id, description in rows:
+            representative = representatives.get(int(content_id))
+            if representative is not None:
+                followers.setdefault(representative, []).append((content_id, description))
+        return followers
 
     def process_incomplete_contents(self):
         try:
             self.db.connect()
             self.fetch_categories()
-
-            # مواردی که title ندارن اما description دارن
-            null_title = self.db.get_purecontent_with_null_title()
-            for content_id, description in null_title:
+            pending = []
+
+            def queue_completion(content_id, title=None, description=None, followers=()):
+                completion = self.request_completion(content_id, title=title, description=description)
+                pending.append(completion)
+                # محتوای تقریباً تکراری همان عنوان و دسته‌بندی نماینده را با توضیحات خودش می‌گیرد
+                if completion:
+                    _, title_out, _, category_title = completion
+                    for follower_id, follower_description in followers:
+                        print(f"♻️ Content ID {follower_id} reuses the completion of content ID {content_id}.")
+                        pending.append((follower_id, title_out, follower_description, category_title))
+                if len(pending) >= COMPLETION_BATCH_SIZE:
+                    self.apply_completions(pending)
+                    pending.clear()
+
+            # مواردی که title ندارن (null یا خالی/نامعتبر) اما description دارن
+            described = []
+            for content_id, description in ((self.db.get_purecontent_with_null_title() or []) +
+                                            (self.db.get_purecontent_with_empty_title() or [])):
                 if description:
-                    self.complete_missing_fields(content_id, description=description)
+                    described.append((content_id, description))
                 else:
                     self.db.update_pure_content(content_id, title=DEFAULT_TITLE)
                     print(f"⚠️ No description found for content ID {content_id}, set default title.")
 
+            # فقط یک نماینده از هر خوشه‌ی تقریباً تکراری به مدل فرستاده می‌شود
+            followers = self.group_near_duplicates(described)
+            follower_ids = {content_id for group in followers.values() for content_id, _ in group}
+            for content_id, description in described:
+                if content_id not in follower_ids:
+                    queue_completion(content_id, description=description,
+                                     followers=followers.get(int(content_id), ()))
+
             # مواردی که description ندارن اما title دارن
             null_desc = self.db.get_purecontent_without_description()
             for content_id, title in null_desc:
                 if title:
-                    self.complete_missing_fields(content_id, title=title)
+                    queue_completion(content_id, title=title)
 
-            # مواردی که title خالی یا نامعتبره
-            empty_title = self.db.get_purecontent_with_empty_title()
-            for content_id, description in empty_title:
-                if description:
-                    self.complete_missing_fields(content_id, description=description)
-                else:
-                    self.db.update_pure_content(content_id, title=DEFAULT_TITLE)
-                    print(f"⚠️ No description found for content ID {content_id}, set default title.")
+            self.apply_completions(pending)
 
         except Exception as e:
             print(f"❗ Error in process_incomplete_contents: {e}")
@@ -1,17 +1,38 @@
-import json
 import datetime
 import re
 import logging
 import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Dict, List, Tuple
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-import nltk
-from content_manager.content_database import ContentDatabase
-import openai
-import requests
+from seo_tools import assets
+from seo_tools import compression
+from seo_tools import expansion
+from seo_tools import formatting
+from seo_tools import html_analysis
+from seo_tools import image_store
+from seo_tools import images
+from seo_tools import internal_links
+from seo_tools import keywords as keyword_engine
+from seo_tools import manifest as build_manifest
+from seo_tools import report
+from seo_tools import rewriter
+from seo_tools import rules
+from seo_tools import score_store as scores
+from seo_tools import similarity
+from seo_tools import templates
+from seo_tools import text_stats
+from seo_tools.resources import NLTK_DATA_DIR, prepare_nltk_data, use_nltk_data_dir
+import json
 import os
 
+OUTPUT_DIR = "output"
+EXPANSION_STORE_PATH = os.path.join(OUTPUT_DIR, ".cache", "expansions.sqlite")
+SCORE_STORE_PATH = os.path.join(OUTPUT_DIR, ".cache", "scores.sqlite")
+NEAR_DUPLICATE_INDEX_PATH = os.path.join(OUTPUT_DIR, ".cache", "near_duplicates.sqlite")
+EXPANSION_WORD_THRESHOLD = 300
+
 # Configure OpenAI API  # اینجا API کلید خود را قرار دهید
 
 # Configure logging with UTF-8 encoding
@@ -26,43 +47,32 @@ class UTFStreamHandler(logging.StreamHandler):
         except Exception:
             self.handleError(record)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('seo_analysis.log', encoding='utf-8'),
-        UTFStreamHandler(sys.stdout)
-    ]
-)
-
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
+def configure_logging():
+    """Configure logging for CLI runs (not at import time, so workers and importers stay cheap)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('seo_analysis.log', encoding='utf-8'),
+            UTFStreamHandler(sys.stdout)
+        ]
+    )
 
 def extract_keywords(content: str, num_keywords: int = 5) -> List[str]:
     try:
-        # Tokenize and clean text
-        words = word_tokenize(content.lower())
-        stop_words = set(stopwords.words('english'))
-        words = [word for word in words if word.isalnum() and word not in stop_words]
-        
-        # Count word frequencies
-        word_freq = {}
-        for word in words:
-            word_freq[word] = word_freq.get(word, 0) + 1
-        
-        # Sort by frequency and return top keywords
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, _ in sorted_words[:num_keywords]]
+        return keyword_engine.extract_keywords(content, num_keywords)
     except Exception as e:
         logging.error(f"Error in extract_keywords: {str(e)}")
         return []
 
-def analyze_content_structure(content: str) -> Dict:
+def extract_corpus_keywords(documents: Dict, num_keywords: int = 5) -> Dict:
+    try:
+        return keyword_engine.extract_corpus_keywords(documents, num_keywords)
+    except Exception as e:
+        logging.error(f"Error in extract_corpus_keywords: {str(e)}")
+        return {}
+
+def analyze_content_structure(content: str, analysis: Dict = None) -> Dict:
     """Analyze content structure including links and mobile-friendliness"""
     structure = {
         'internal_links': [],
@@ -74,22 +84,13 @@ def analyze_content_structure(content: str) -> Dict:
     }
     
     try:
-        # Enhanced link checking
-        link_pattern = r'<a[^>]*href=["\'](.*?)["\'][^>]*>'
-        links = re.findall(link_pattern, content, re.IGNORECASE)
-        for link in links:
-            if link.startswith(('http', 'https', '//')):
-                structure['external_links'].append(link)
-            else:
-                structure['internal_links'].append(link)
-        
-        # Additional SEO checks
-        structure['has_schema_markup'] = bool(re.search(r'itemtype=["\'](.*?)["\']', content, re.IGNORECASE))
-        structure['has_meta_viewport'] = bool(re.search(r'<meta[^>]+viewport[^>]+>', content, re.IGNORECASE))
-        structure['has_canonical'] = bool(re.search(r'<link[^>]+rel=["\'](canonical)["\'][^>]*>', content, re.IGNORECASE))
+        # One parser pass collects links and technical SEO tags
+        analysis = analysis or html_analysis.analyze_html(content)
+        for key in ('internal_links', 'external_links', 'has_schema_markup', 'has_meta_viewport', 'has_canonical'):
+            structure[key] = analysis[key]
         
         # Enhanced mobile-friendliness check
-        if len(content) > 1000:
+        if analysis['length'] > 1000:
             if not structure['has_meta_viewport']:
                 structure['mobile_friendly'] = False
             
@@ -99,129 +100,77 @@ def analyze_content_structure(content: str) -> Dict:
     return structure
 
 def get_image_for_content(query, width=800, height=400):
-    """Get a placeholder image for content"""
+    """Get a placeholder image for content (JPEG fallback path of the content-addressed image store)"""
     try:
-        # Create output directory if it doesn't exist
-        output_dir = "output"
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-            
-        # Create images directory inside output
-        images_dir = os.path.join(output_dir, "images")
-        if not os.path.exists(images_dir):
-            os.makedirs(images_dir)
-        
-        # Clean filename - remove special characters and spaces
-        filename = re.sub(r'[^\w\s-]', '', query.lower())
-        filename = re.sub(r'[-\s]+', '_', filename)
-        
-        # Ensure filename isn't too long
-        if len(filename) > 50:
-            filename = filename[:50]
-        
-        image_path = os.path.join(images_dir, f"{filename}.jpg")
-        
-        # Create a new image with a gradient background
-        image = Image.new('RGB', (width, height))
-        draw = ImageDraw.Draw(image)
-        
-        # Create gradient background
-        for y in range(height):
-            r = int((y / height) * 100 + 100)
-            g = int((y / height) * 100 + 150)
-            b = int((y / height) * 100 + 200)
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
-        
-        # Add text
-        font_size = 40
-        try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except:
-            font = ImageFont.load_default()
-        
-        # Wrap text
-        words = query.split()
-        lines = []
-        current_line = []
-        for word in words:
-            current_line.append(word)
-            text = ' '.join(current_line)
-            if draw.textlength(text, font=font) > width - 40:
-                current_line.pop()
-                lines.append(' '.join(current_line))
-                current_line = [word]
-        if current_line:
-            lines.append(' '.join(current_line))
-        
-        # Calculate text position
-        text_height = len(lines) * (font_size + 10)
-        y = (height - text_height) // 2
-        
-        # Draw text
-        for line in lines:
-            text_width = draw.textlength(line, font=font)
-            x = (width - text_width) // 2
-            draw.text((x, y), line, font=font, fill=(255, 255, 255))
-            y += font_size + 10
-        
-        # Save image
-        image.save(image_path, quality=95)
-        return image_path
+        store = image_store.ImageStore(os.path.join(OUTPUT_DIR, "images"))
+        asset = store.get_or_create(query, width, height)
+        return store.fallback_path(asset)
     except Exception as e:
         logging.error(f"Error in get_image_for_content: {str(e)}")
         # Create a simple fallback image with error message
-        image = Image.new('RGB', (width, height), color='gray')
-        draw = ImageDraw.Draw(image)
-        font = ImageFont.load_default()
-        draw.text((10, height//2), f"Image generation failed: {str(e)}", fill='white', font=font)
+        image_path = os.path.join(OUTPUT_DIR, "images", f"{image_store.image_key(query, width, height)}-error.jpg")
+        os.makedirs(os.path.dirname(image_path), exist_ok=True)
+        image = images.render_error_image(f"Image generation failed: {str(e)}", width, height)
         image.save(image_path)
         return image_path
 
+def get_image_html(query, alt=None, width=800, height=400, create=True):
+    """<picture> markup (AVIF/WebP sources, JPEG fallback, srcset, width/height) for a content image;
+    with create=False only the markup is built and the files are left to an ImageBatch"""
+    try:
+        store = image_store.ImageStore(os.path.join(OUTPUT_DIR, "images"))
+        asset = store.get_or_create(query, width, height) if create else store.asset(query, width, height)
+        return image_store.picture_html(asset, alt if alt is not None else query)
+    except Exception as e:
+        logging.error(f"Error in get_image_html: {str(e)}")
+        return ""
+
+def generate_content_images(rows, workers=1, width=800, height=400):
+    """Backfill hero images for (Id, Title, ...) rows across a process pool, logging each as it finishes"""
+    store = image_store.ImageStore(os.path.join(OUTPUT_DIR, "images"))
+    jobs = [(title, width, height) for _, title, *_ in rows if title]
+    generated = 0
+    for (title, _, _), asset in image_store.generate_images(store, jobs, workers=workers):
+        if asset is None:
+            logging.error(f"❌ خطا در ساخت تصویر برای: {title}")
+            continue
+        generated += 1
+        logging.info(f"🖼️ {store.fallback_path(asset)}")
+    logging.info(f"✅ {generated} از {len(jobs)} تصویر آماده شد.")
+    return generated
+
+def find_near_duplicates(rows, index_path=NEAR_DUPLICATE_INDEX_PATH):
+    """Update the persisted MinHash LSH index with (Id, Title, Description, ...) rows and return its clusters"""
+    from content_manager.near_duplicates import MinHashLSHIndex
+
+    index = MinHashLSHIndex(index_path)
+    try:
+        changed = index.update(((row[0], row[2]) for row in rows), prune=True)
+        logging.info(f"🔎 امضای {changed} محتوا به‌روز شد.")
+        return index.clusters()
+    finally:
+        index.close()
+
+def write_near_duplicate_report(clusters, total_content, output_dir=OUTPUT_DIR):
+    """Write the near-duplicate clusters (representative = lowest Id) to a JSON report"""
+    os.makedirs(output_dir, exist_ok=True)
+    report_file = os.path.join(output_dir, f"near_duplicates_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    duplicates = sum(len(cluster) - 1 for cluster in clusters)
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            'total_content': total_content,
+            'duplicate_content': duplicates,
+            'clusters': [{'representative': cluster[0], 'members': cluster} for cluster in clusters]
+        }, f, ensure_ascii=False, indent=2)
+    logging.info(f"✅ {len(clusters)} خوشه‌ی تکراری با {duplicates} محتوای اضافی پیدا شد.")
+    logging.info(f"نتایج در فایل {report_file} ذخیره شد.")
+    return report_file
+
 def create_placeholder_image(query, width, height, image_path):
     """Create a placeholder image with text"""
     try:
-        # Create a new image with a gradient background
-        image = Image.new('RGB', (width, height))
-        draw = ImageDraw.Draw(image)
-        
-        # Create gradient background
-        for y in range(height):
-            r = int((y / height) * 100 + 100)
-            g = int((y / height) * 100 + 150)
-            b = int((y / height) * 100 + 200)
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
-        
-        # Add text
-        font_size = 40
-        try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except:
-            font = ImageFont.load_default()
-        
-        # Wrap text
-        words = query.split()
-        lines = []
-        current_line = []
-        for word in words:
-            current_line.append(word)
-            text = ' '.join(current_line)
-            if draw.textlength(text, font=font) > width - 40:
-                current_line.pop()
-                lines.append(' '.join(current_line))
-                current_line = [word]
-        if current_line:
-            lines.append(' '.join(current_line))
-        
-        # Calculate text position
-        text_height = len(lines) * (font_size + 10)
-        y = (height - text_height) // 2
-        
-        # Draw text
-        for line in lines:
-            text_width = draw.textlength(line, font=font)
-            x = (width - text_width) // 2
-            draw.text((x, y), line, font=font, fill=(255, 255, 255))
-            y += font_size + 10
+        # Gradient background and centered, wrapped title
+        image = images.render_placeholder(query, width, height)
         
         # Save image
         image.save(image_path, quality=95)
@@ -230,170 +179,47 @@ def create_placeholder_image(query, width, height, image_path):
         logging.error(f"Error creating placeholder image: {str(e)}")
         return None
 
-def convert_to_html(content, title, description):
-    """Convert content to HTML format"""
+def convert_to_html(content, title, description, stylesheet_href=None, inline_critical=False):
+    """Convert content to HTML format (CSS inline, or linked to the shared stylesheet when stylesheet_href is set)"""
     try:
         # Ensure title and description are not None
         safe_title = title if title else "Untitled"
         safe_description = description if description else ""
         
-        html_content = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=5.0">
-    <meta name="robots" content="index, follow">
-    <link rel="canonical" href="https://yourdomain.com/content/{content.get('id', '')}">
-    <title>{safe_title}</title>
-    <meta name="description" content="{safe_description}">
-    <meta name="keywords" content="{', '.join(content.get('keywords', []))}">
-    
-    <!-- Open Graph / Facebook -->
-    <meta property="og:type" content="article">
-    <meta property="og:url" content="https://yourdomain.com/content/{content.get('id', '')}">
-    <meta property="og:title" content="{safe_title}">
-    <meta property="og:description" content="{safe_description}">
-    
-    <!-- Twitter -->
-    <meta property="twitter:card" content="summary">
-    <meta property="twitter:url" content="https://yourdomain.com/content/{content.get('id', '')}">
-    <meta property="twitter:title" content="{safe_title}">
-    <meta property="twitter:description" content="{safe_description}">
-    
-    <!-- Custom CSS -->
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        
-        h1, h2, h3 {{
-            color: #2c3e50;
-            margin-top: 30px;
-        }}
-        
-        h1 {{
-            font-size: 2.5em;
-            border-bottom: 2px solid #3498db;
-            padding-bottom: 10px;
-        }}
-        
-        h2 {{
-            font-size: 1.8em;
-            color: #2980b9;
-        }}
-        
-        h3 {{
-            font-size: 1.4em;
-            color: #34495e;
-        }}
-        
-        p {{
-            margin-bottom: 20px;
-            font-size: 1.1em;
-        }}
-        
-        .content-section {{
-            margin-bottom: 40px;
-            padding: 20px;
-            background: #f8f9fa;
-            border-radius: 5px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        }}
-        
-        .table-of-contents {{
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 5px;
-            margin: 20px 0;
-        }}
-        
-        .table-of-contents ul {{
-            list-style-type: none;
-            padding: 0;
-        }}
-        
-        .table-of-contents li {{
-            margin: 10px 0;
-        }}
-        
-        a {{
-            color: #3498db;
-            text-decoration: none;
-        }}
-        
-        a:hover {{
-            text-decoration: underline;
-        }}
-        
-        @media (max-width: 768px) {{
-            body {{
-                padding: 10px;
-            }}
-            
-            h1 {{
-                font-size: 2em;
-            }}
-            
-            h2 {{
-                font-size: 1.5em;
-            }}
-            
-            h3 {{
-                font-size: 1.2em;
-            }}
-            
-            p {{
-                font-size: 1em;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <article itemscope itemtype="https://schema.org/Article">
-        <meta itemprop="headline" content="{safe_title}">
-        <meta itemprop="description" content="{safe_description}">
-        <meta itemprop="author" content="{content.get('author', 'Anonymous')}">
-        <meta itemprop="datePublished" content="{datetime.datetime.now().isoformat()}">
-        
-        <h1 itemprop="name">{safe_title}</h1>
-        
-        <nav class="table-of-contents">
-            <h2>Table of Contents</h2>
-            <ul>
-                <li><a href="#introduction">Introduction</a></li>
-                {''.join([f'<li><a href="#{section.get("title", "").lower().replace(" ", "-")}">{section.get("title", "")}</a></li>' for section in content.get("sections", [])])}
-            </ul>
-        </nav>
-        
-        <div itemprop="articleBody">
-            <section id="introduction" class="content-section">
-                <h2>Introduction</h2>
-                <p>{content.get('introduction', safe_description)}</p>
-            </section>'''
+        content_id = content.get('id', '')
+        sections = content.get('sections', [])
+
+        toc = ''.join([
+            templates.ARTICLE_TOC_ITEM.render(id=templates.slugify(section.get('title', '')), title=section.get('title', ''))
+            for section in sections
+        ])
 
         # Add sections
-        for section in content.get('sections', []):
+        section_html = []
+        for section in sections:
             section_title = section.get('title', '')
             section_content = section.get('content', '')
             if section_title and section_content:
-                section_id = section_title.lower().replace(' ', '-')
-                html_content += f'''
-            <section id="{section_id}" class="content-section">
-                <h2>{section_title}</h2>
-                <p>{section_content}</p>
-            </section>'''
-
-        # Close HTML tags
-        html_content += '''
-        </div>
-    </article>
-</body>
-</html>'''
+                section_html.append(templates.ARTICLE_SECTION.render(
+                    id=templates.slugify(section_title),
+                    title=section_title,
+                    content=section_content
+                ))
+
+        html_content = templates.ARTICLE_PAGE.render(
+            id=content_id,
+            title=safe_title,
+            description=safe_description,
+            keywords=', '.join(content.get('keywords', [])),
+            styles=assets.style_tags(stylesheet_href, inline_critical),
+            author=content.get('author', 'Anonymous'),
+            date_published=datetime.datetime.now().isoformat(),
+            toc=toc,
+            hero=content.get('hero', ''),
+            # Internal links found for the description go into the published introduction
+            introduction=content.get('introduction') or content.get('linked_description') or safe_description,
+            sections=''.join(section_html)
+        )
 
         return html_content
         
@@ -401,126 +227,74 @@ def convert_to_html(content, title, description):
         logging.error(f"Error in convert_to_html: {str(e)}")
         return ""
 
-def save_html_file(content, title, description, content_id):
-    """Save content as HTML file"""
+def html_file_path(content_id, output_dir=OUTPUT_DIR):
+    return os.path.join(output_dir, f"content_{content_id}.html")
+
+def write_html_file(html_content, content_id, output_dir=OUTPUT_DIR):
+    """Write an already rendered page atomically"""
     try:
-        # Convert content to HTML
-        html_content = convert_to_html(content, title, description)
+        os.makedirs(output_dir, exist_ok=True)
+        filename = html_file_path(content_id, output_dir)
+        tmp_filename = f"{filename}.tmp"
         
-        # Create filename
-        filename = f"content_{content_id}.html"
-        
-        # Save file
-        with open(filename, 'w', encoding='utf-8') as f:
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
             f.write(html_content)
+        os.replace(tmp_filename, filename)
             
         logging.info(f"✅ HTML file saved as {filename}")
         return filename
         
     except Exception as e:
-        logging.error(f"Error in save_html_file: {str(e)}")
+        logging.error(f"Error in write_html_file: {str(e)}")
         return None
 
-def calculate_seo_score(content, seo_data):
-    score = 100
-    issues = {
-        'critical': [],
-        'important': [],
-        'moderate': [],
-        'minor': []
-    }
-    suggestions = []
-    
+def save_html_file(content, title, description, content_id, output_dir=OUTPUT_DIR,
+                   stylesheet_href=None, inline_critical=False):
+    """Save content as HTML file"""
     try:
-        # بررسی عنوان (25 امتیاز)
-        title = seo_data.get('meta_title', '')
-        if not title:
-            issues['critical'].append("عنوان متا وجود ندارد")
-            score -= 25
-        elif len(title) > 60:
-            issues['important'].append("عنوان متا خیلی طولانی است (بیش از 60 کاراکتر)")
-            score -= 15
-        elif len(title) < 30:
-            issues['moderate'].append("عنوان متا خیلی کوتاه است (کمتر از 30 کاراکتر)")
-            score -= 10
-
-        # بررسی محتوا (35 امتیاز)
-        content_text = str(content.get('content', ''))
-        word_count = len(content_text.split())
-        
-        # بهبود محتوا با استفاده از هوش مصنوعی اگر خیلی کوتاه باشد
-        if word_count < 300:
-            improved_content = improve_content(content, title, seo_data.get('meta_description', ''))
-            content['content'] = improved_content
-            word_count = len(improved_content.split())
-            content_text = improved_content
-        
-        if word_count < 300:
-            issues['critical'].append("محتوا خیلی کوتاه است (کمتر از 300 کلمه)")
-            score -= 25
-        elif word_count < 500:
-            issues['important'].append("محتوا می‌تواند طولانی‌تر باشد (کمتر از 500 کلمه)")
-            score -= 10
-
-        # بررسی ساختار (25 امتیاز)
-        structure = analyze_content_structure(content_text)
-        
-        if not structure['internal_links']:
-            issues['important'].append("لینک داخلی وجود ندارد")
-            score -= 8
-        if not structure['external_links']:
-            issues['moderate'].append("لینک خارجی وجود ندارد")
-            score -= 7
-
-        # بررسی فنی (15 امتیاز)
-        if not structure['has_meta_viewport']:
-            issues['important'].append("تگ viewport برای موبایل وجود ندارد")
-            score -= 8
-        if not structure['has_schema_markup']:
-            issues['moderate'].append("Schema Markup وجود ندارد")
-            score -= 4
-        if not structure['has_canonical']:
-            issues['minor'].append("لینک canonical وجود ندارد")
-            score -= 3
-
-        # Generate prioritized suggestions
-        for severity, severity_issues in issues.items():
-            for issue in severity_issues:
-                if "عنوان متا" in issue:
-                    suggestions.append({
-                        'priority': 1,
-                        'text': "طول عنوان متا را بین 30 تا 60 کاراکتر تنظیم کنید"
-                    })
-                elif "محتوا" in issue and "کوتاه" in issue:
-                    suggestions.append({
-                        'priority': 1,
-                        'text': "محتوا را به حداقل 300 کلمه افزایش دهید"
-                    })
-                elif "لینک داخلی" in issue:
-                    suggestions.append({
-                        'priority': 2,
-                        'text': "لینک‌های داخلی به محتوای مرتبط اضافه کنید"
-                    })
-                elif "viewport" in issue:
-                    suggestions.append({
-                        'priority': 1,
-                        'text': "تگ viewport برای سازگاری با موبایل اضافه کنید"
-                    })
-                elif "Schema Markup" in issue:
-                    suggestions.append({
-                        'priority': 3,
-                        'text': "Schema Markup مناسب برای محتوا اضافه کنید"
-                    })
-
-        # Sort suggestions by priority
-        suggestions.sort(key=lambda x: x['priority'])
+        # Convert content to HTML
+        html_content = convert_to_html(content, title, description, stylesheet_href, inline_critical)
+        return write_html_file(html_content, content_id, output_dir)
         
-        return {
-            'score': max(0, min(score, 100)),  # Ensure score is between 0 and 100
+    except Exception as e:
+        logging.error(f"Error in save_html_file: {str(e)}")
+        return None
+
+def extract_seo_features(content, seo_data, analysis: Dict = None) -> Dict:
+    """Precompute the per-row inputs of the scoring rules"""
+    content_text = str(content.get('content', ''))
+    structure = analyze_content_structure(content_text, analysis)
+    return {
+        'title_length': len(seo_data.get('meta_title', '') or ''),
+        'word_count': len(content_text.split()),
+        'internal_links': len(structure['internal_links']),
+        'external_links': len(structure['external_links']),
+        'has_meta_viewport': int(structure['has_meta_viewport']),
+        'has_schema_markup': int(structure['has_schema_markup']),
+        'has_canonical': int(structure['has_canonical'])
+    }
+
+def calculate_seo_scores(feature_rows: List[Dict]) -> List[Dict]:
+    """Score a batch of feature rows in one vectorized pass of the compiled rule set"""
+    if not feature_rows:
+        return []
+    ruleset = rules.get_ruleset()
+    scores, fired = ruleset.evaluate(rules.to_columns(feature_rows))
+    results = []
+    for features, score, fired_row in zip(feature_rows, scores, fired):
+        issues, suggestions = ruleset.explain(fired_row)
+        results.append({
+            'score': int(score),
             'issues': issues,
-            'suggestions': suggestions
-        }
-        
+            'suggestions': suggestions,
+            # Short content is expanded by the separate 'expand' stage, never inline while scoring
+            'needs_expansion': features['word_count'] < EXPANSION_WORD_THRESHOLD
+        })
+    return results
+
+def calculate_seo_score(content, seo_data, analysis: Dict = None):
+    try:
+        return calculate_seo_scores([extract_seo_features(content, seo_data, analysis)])[0]
     except Exception as e:
         logging.error(f"Error in calculate_seo_score: {str(e)}")
         return {
@@ -536,7 +310,7 @@ def get_grade(score: int) -> str:
     elif score >= 60: return 'D'
     else: return 'F'
 
-def generate_seo_metadata(content):
+def generate_seo_metadata(content, stylesheet_href=None, inline_critical=False):
     """Generate SEO metadata for content with enhanced structure"""
     try:
         title = str(content.get('title', ''))
@@ -561,8 +335,8 @@ def generate_seo_metadata(content):
         if not description:
             description = f"Learn about {title}. Discover insights, tips, and information about this topic."
         
-        # Extract keywords from content
-        keywords = extract_keywords(description)
+        # Use corpus-level keywords when the batch computed them, otherwise extract from content
+        keywords = content.get('keywords') or extract_keywords(description)
         
         # Generate table of contents with more sections
         toc_items = [
@@ -576,256 +350,43 @@ def generate_seo_metadata(content):
             "Conclusion"
         ]
         
-        toc_html = "\n".join([f"<li><a href='#{item.lower().replace(' ', '-')}'>{item}</a></li>" for item in toc_items])
+        toc_html = "\n".join([templates.ENHANCED_TOC_ITEM.render(id=templates.slugify(item), title=item) for item in toc_items])
         
         # Generate external links
+        title_slug = templates.slugify(title)
         external_links = [
             {
-                'url': f"https://example.com/{title.lower().replace(' ', '-')}",
+                'url': f"https://example.com/{title_slug}",
                 'text': f"Learn more about {title}",
                 'rel': 'nofollow'
             },
             {
-                'url': f"https://example.com/resources/{title.lower().replace(' ', '-')}",
+                'url': f"https://example.com/resources/{title_slug}",
                 'text': f"Additional resources for {title}",
                 'rel': 'nofollow'
             },
             {
-                'url': f"https://example.com/guide/{title.lower().replace(' ', '-')}",
+                'url': f"https://example.com/guide/{title_slug}",
                 'text': f"Complete guide to {title}",
                 'rel': 'nofollow'
             }
         ]
         
         # Enhanced content structure with semantic HTML and rich content
-        enhanced_content = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=5.0">
-            <meta name="robots" content="index, follow">
-            <link rel="canonical" href="https://yourdomain.com/content/{content.get('id', '')}">
-            <title>{meta_title}</title>
-            <meta name="description" content="{description}">
-            <meta name="keywords" content="{', '.join(keywords)}">
-            
-            <!-- Open Graph / Facebook -->
-            <meta property="og:type" content="article">
-            <meta property="og:url" content="https://yourdomain.com/content/{content.get('id', '')}">
-            <meta property="og:title" content="{meta_title}">
-            <meta property="og:description" content="{description}">
-            
-            <!-- Twitter -->
-            <meta property="twitter:card" content="summary">
-            <meta property="twitter:url" content="https://yourdomain.com/content/{content.get('id', '')}">
-            <meta property="twitter:title" content="{meta_title}">
-            <meta property="twitter:description" content="{description}">
-            
-            <!-- Custom CSS -->
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                
-                h1, h2, h3 {{
-                    color: #2c3e50;
-                    margin-top: 30px;
-                }}
-                
-                h1 {{
-                    font-size: 2.5em;
-                    border-bottom: 2px solid #3498db;
-                    padding-bottom: 10px;
-                }}
-                
-                h2 {{
-                    font-size: 1.8em;
-                    color: #2980b9;
-                }}
-                
-                h3 {{
-                    font-size: 1.4em;
-                    color: #34495e;
-                }}
-                
-                p {{
-                    margin-bottom: 20px;
-                    font-size: 1.1em;
-                }}
-                
-                ul, ol {{
-                    margin-bottom: 20px;
-                    padding-left: 20px;
-                }}
-                
-                li {{
-                    margin-bottom: 10px;
-                }}
-                
-                a {{
-                    color: #3498db;
-                    text-decoration: none;
-                }}
-                
-                a:hover {{
-                    text-decoration: underline;
-                }}
-                
-                .table-of-contents {{
-                    background: #f8f9fa;
-                    padding: 20px;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                }}
-                
-                .table-of-contents ul {{
-                    list-style-type: none;
-                    padding: 0;
-                }}
-                
-                .table-of-contents li {{
-                    margin: 10px 0;
-                }}
-                
-                section {{
-                    margin-bottom: 40px;
-                    padding: 20px;
-                    background: #fff;
-                    border-radius: 5px;
-                    box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-                }}
-                
-                @media (max-width: 768px) {{
-                    body {{
-                        padding: 10px;
-                    }}
-                    
-                    h1 {{
-                        font-size: 2em;
-                    }}
-                    
-                    h2 {{
-                        font-size: 1.5em;
-                    }}
-                    
-                    h3 {{
-                        font-size: 1.2em;
-                    }}
-                    
-                    p {{
-                        font-size: 1em;
-                    }}
-                }}
-            </style>
-        </head>
-        <body>
-            <article itemscope itemtype="https://schema.org/Article">
-                <meta itemprop="headline" content="{meta_title}">
-                <meta itemprop="description" content="{description}">
-                <meta itemprop="author" content="{content.get('author', 'Anonymous')}">
-                <meta itemprop="datePublished" content="{datetime.datetime.now().isoformat()}">
-                
-                <h1 itemprop="name">{title}</h1>
-                
-                <nav class="table-of-contents">
-                    <h2>Table of Contents</h2>
-                    <ul>
-                        {toc_html}
-                    </ul>
-                </nav>
-                
-                <div itemprop="articleBody">
-                    <section id="introduction-to-{title.lower().replace(' ', '-')}">
-                        <h2>Introduction to {title}</h2>
-                        <p>{description}</p>
-                        <p>Welcome to our comprehensive guide on {title}. This article will help you understand the key concepts and practical applications.</p>
-                        <p>Whether you're a beginner or an experienced professional, you'll find valuable insights and actionable tips.</p>
-                    </section>
-                    
-                    <section id="key-features-and-benefits">
-                        <h2>Key Features and Benefits</h2>
-                        <p>Here are the main features and benefits of {title}:</p>
-                        <ul>
-                            <li>Comprehensive overview and understanding</li>
-                            <li>Practical applications and real-world use cases</li>
-                            <li>Industry best practices and standards</li>
-                            <li>Easy integration with existing systems</li>
-                            <li>Future trends and developments</li>
-                        </ul>
-                    </section>
-                    
-                    <section id="how-to-get-started">
-                        <h2>How to Get Started</h2>
-                        <p>Getting started with {title} is easy. Follow these simple steps:</p>
-                        <ol>
-                            <li>Learn the basics and understand requirements</li>
-                            <li>Set up your environment and tools</li>
-                            <li>Follow best practices and guidelines</li>
-                            <li>Monitor and optimize your results</li>
-                        </ol>
-                    </section>
-                    
-                    <section id="best-practices-and-tips">
-                        <h2>Best Practices and Tips</h2>
-                        <p>To get the most out of {title}, follow these best practices:</p>
-                        <ul>
-                            <li>Keep your system updated and maintained</li>
-                            <li>Optimize performance regularly</li>
-                            <li>Follow security best practices</li>
-                            <li>Focus on user experience</li>
-                        </ul>
-                    </section>
-                    
-                    <section id="common-questions-and-answers">
-                        <h2>Common Questions and Answers</h2>
-                        <div itemscope itemtype="https://schema.org/FAQPage">
-                            <div itemscope itemprop="mainEntity" itemtype="https://schema.org/Question">
-                                <h3 itemprop="name">What are the main benefits of {title}?</h3>
-                                <div itemscope itemprop="acceptedAnswer" itemtype="https://schema.org/Answer">
-                                    <div itemprop="text">
-                                        <p>{title} offers many benefits. It improves efficiency, enhances user experience, and boosts performance. Learn more in our detailed guide.</p>
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                    </section>
-                    
-                    <section id="case-studies-and-examples">
-                        <h2>Case Studies and Examples</h2>
-                        <p>Here are some real-world examples of {title} in action:</p>
-                        <ul>
-                            <li>Success story: How Company X improved results</li>
-                            <li>Implementation: Overcoming challenges</li>
-                            <li>Results: Measurable improvements</li>
-                        </ul>
-                    </section>
-                    
-                    <section id="additional-resources">
-                        <h2>Additional Resources</h2>
-                        <p>Want to learn more about {title}? Check out these resources:</p>
-                        <ul>
-                            <li><a href="{external_links[0]['url']}" rel="{external_links[0]['rel']}">{external_links[0]['text']}</a></li>
-                            <li><a href="{external_links[1]['url']}" rel="{external_links[1]['rel']}">{external_links[1]['text']}</a></li>
-                            <li><a href="{external_links[2]['url']}" rel="{external_links[2]['rel']}">{external_links[2]['text']}</a></li>
-                        </ul>
-                    </section>
-                    
-                    <section id="conclusion">
-                        <h2>Conclusion</h2>
-                        <p>{title} is a powerful tool for modern professionals. By following the guidelines in this article, you can achieve great results.</p>
-                        <p>Start implementing these best practices today to see the benefits.</p>
-                    </section>
-                </div>
-            </article>
-        </body>
-        </html>
-        """
+        enhanced_content = templates.ENHANCED_PAGE.render(
+            id=content.get('id', ''),
+            meta_title=meta_title,
+            description=description,
+            body_description=content.get('linked_description') or description,
+            keywords=', '.join(keywords),
+            styles=assets.style_tags(stylesheet_href, inline_critical),
+            author=content.get('author', 'Anonymous'),
+            date_published=datetime.datetime.now().isoformat(),
+            title=title,
+            title_slug=title_slug,
+            toc=toc_html,
+            resource_links=templates.RESOURCE_LINK_SEPARATOR.join([templates.RESOURCE_LINK.render(**link) for link in external_links])
+        )
         
         return {
             'meta_title': meta_title,
@@ -997,11 +558,11 @@ def improve_content(content, title, description):
         logging.error(f"Error in improve_content: {str(e)}")
         return content
 
-def generate_ai_content():
+def generate_ai_content(prompt=None):
     """Generate content using AI API"""
     try:
-        # پرامپت برای تولید توضیحات متا
-        prompt = """
+        # پرامپت پیش‌فرض برای تولید توضیحات متا
+        prompt = prompt or """
         Please generate a complete and well-structured meta description for a webpage. The description should fully explain what the page is about, why the user should be interested in it, and summarize the key points in a compelling and clear manner.
 
         Ensure that the sentences are logically connected and flow smoothly. Do not leave any sentence incomplete, and avoid cutting off the description in the middle. The description should be easy to read, natural, and clear. It should also be SEO-friendly and between 150-160 characters.
@@ -1009,6 +570,8 @@ def generate_ai_content():
         Make sure to conclude sentences properly and do not stop abruptly in the middle of thoughts or sentences. For example, if the description is about a footballer, like Cristiano Ronaldo, include details about his career, achievements, and background in a coherent and complete way. Ensure the description is grammatically correct and avoids abrupt or incomplete sentences.
         """
         
+        import openai
+
         # تنظیمات پیشرفته برای تولید محتوای بهتر
         response = openai.Completion.create(
             engine="text-davinci-003",
@@ -1041,168 +604,90 @@ def generate_ai_content():
         logging.error(f"Error in generate_ai_content: {str(e)}")
         return ""
 
+def expand_content(title, description, content):
+    """Expansion stage worker: returns the AI-expanded content, or None when nothing better was produced"""
+    improved_content = improve_content({'content': content}, title, description)
+    if isinstance(improved_content, str) and improved_content != content:
+        return improved_content
+    return None
+
 def format_content(content):
-    """Format and structure the content with appropriate headings and paragraphs"""
+    """Format and structure the content with appropriate headings and paragraphs (single-pass block tokenizer)"""
     try:
-        # تقسیم محتوا به بخش‌های موضوعی
-        sections = content.split('\n\n')
-        formatted_content = ""
-        
-        # لیست بخش‌های پیش‌فرض
-        default_sections = [
-            "مقدمه",
-            "نکات کلیدی",
-            "مزایا و ویژگی‌ها",
-            "نحوه استفاده",
-            "بهترین شیوه‌ها",
-            "سوالات متداول",
-            "مطالعات موردی",
-            "منابع بیشتر",
-            "نتیجه‌گیری"
-        ]
-        
-        current_section = 0
-        paragraph_count = 0
-        
-        for section in sections:
-            if section.strip():
-                # اگر بخش با عنوان شروع شده باشد
-                if section.startswith('#'):
-                    level = len(section.split()[0])
-                    title = section.replace('#' * level, '').strip()
-                    formatted_content += f'<h{level} class="section-title">{title}</h{level}>\n'
-                # اگر بخش با لیست شروع شده باشد
-                elif section.startswith('- '):
-                    # اگر بخش جدیدی شروع شده، عنوان مناسب اضافه کن
-                    if current_section < len(default_sections):
-                        formatted_content += f'<h2 class="section-heading">{default_sections[current_section]}</h2>\n'
-                        current_section += 1
-                    
-                    items = section.split('\n')
-                    formatted_content += '<ul class="feature-list">\n'
-                    for item in items:
-                        if item.strip():
-                            formatted_content += f'<li class="list-item">{item.replace("- ", "")}</li>\n'
-                    formatted_content += '</ul>\n'
-                # اگر بخش با نقل قول شروع شده باشد
-                elif section.startswith('>'):
-                    quote = section.replace('>', '').strip()
-                    formatted_content += f'<blockquote class="expert-quote">{quote}</blockquote>\n'
-                # اگر بخش با عدد شروع شده باشد (مراحل یا نکات)
-                elif re.match(r'^\d+\.', section):
-                    if current_section < len(default_sections):
-                        formatted_content += f'<h2 class="section-heading">{default_sections[current_section]}</h2>\n'
-                        current_section += 1
-                    
-                    items = section.split('\n')
-                    formatted_content += '<ol class="step-list">\n'
-                    for item in items:
-                        if item.strip():
-                            # حذف شماره از ابتدای خط
-                            clean_item = re.sub(r'^\d+\.\s*', '', item)
-                            formatted_content += f'<li class="step-item">{clean_item}</li>\n'
-                    formatted_content += '</ol>\n'
-                # اگر بخش با کلمه کلیدی شروع شده باشد
-                elif any(keyword in section.lower() for keyword in ['نکته:', 'توجه:', 'مهم:', 'هشدار:']):
-                    if current_section < len(default_sections):
-                        formatted_content += f'<h3 class="subsection-heading">{default_sections[current_section]}</h3>\n'
-                        current_section += 1
-                    
-                    formatted_content += f'<div class="important-note">{section}</div>\n'
-                # در غیر این صورت، پاراگراف معمولی
-                else:
-                    # هر 3 پاراگراف یک تیتر H2 اضافه کن
-                    if paragraph_count % 3 == 0 and current_section < len(default_sections):
-                        formatted_content += f'<h2 class="section-heading">{default_sections[current_section]}</h2>\n'
-                        current_section += 1
-                    
-                    # تقسیم متن به پاراگراف‌های کوچکتر برای خوانایی بهتر
-                    paragraphs = section.split('. ')
-                    for paragraph in paragraphs:
-                        if paragraph.strip():
-                            formatted_content += f'<p class="content-paragraph">{paragraph.strip()}.</p>\n'
-                            paragraph_count += 1
-        
-        return formatted_content
+        return formatting.format_blocks(content)
     except Exception as e:
         logging.error(f"Error in format_content: {str(e)}")
         return content
 
-def optimize_seo(content):
-    """Optimize content for SEO"""
+def optimize_seo(content, related_topics=None):
+    """Optimize content for SEO: CSS classes, internal links and image attributes in one pass"""
     try:
-        # اضافه کردن کلاس‌های CSS برای استایل‌دهی
-        content = content.replace('<h1', '<h1 class="main-title"')
-        content = content.replace('<h2', '<h2 class="section-heading"')
-        content = content.replace('<h3', '<h3 class="subsection-heading"')
-        content = content.replace('<p', '<p class="content-text"')
-        content = content.replace('<ul', '<ul class="content-list"')
-        content = content.replace('<li', '<li class="list-item"')
-        
-        # اضافه کردن لینک‌های داخلی
-        content = add_internal_links(content)
-        
-        # بهینه‌سازی تصاویر
-        content = optimize_images(content)
-        
-        return content
+        return rewriter.rewrite_html(content, rewriter.TopicLinker(related_topics or []))
     except Exception as e:
         logging.error(f"Error in optimize_seo: {str(e)}")
         return content
 
-def add_internal_links(content):
+def add_internal_links(content, related_topics=None):
     """Add internal links to content"""
     try:
         # اضافه کردن لینک‌های مرتبط
-        related_topics = extract_related_topics(content)
-        for topic in related_topics:
-            link = f'<a href="/topic/{topic.lower().replace(" ", "-")}" class="internal-link">{topic}</a>'
-            content = content.replace(topic, link, 1)
-        return content
+        return rewriter.rewrite_html(content, rewriter.TopicLinker(related_topics or []),
+                                     tag_classes={}, optimize_images=False)
     except Exception as e:
         logging.error(f"Error in add_internal_links: {str(e)}")
         return content
 
+def link_internal_mentions(content, automaton, content_id=None, max_links=internal_links.MAX_LINKS_PER_PAGE):
+    """Link mentions of other pages' titles and categories (never the page itself), outside existing tags"""
+    try:
+        exclude = {os.path.basename(html_file_path(content_id))} if content_id is not None else ()
+        return rewriter.rewrite_html(content, automaton.linker(exclude, max_links),
+                                     tag_classes={}, optimize_images=False)
+    except Exception as e:
+        logging.error(f"Error in link_internal_mentions: {str(e)}")
+        return content
+
 def optimize_images(content):
     """Optimize images in content"""
     try:
         # اضافه کردن alt text و lazy loading
-        content = re.sub(r'<img([^>]*)>', r'<img\1 loading="lazy" alt="\1">', content)
-        return content
+        return rewriter.rewrite_html(content, tag_classes={})
     except Exception as e:
         logging.error(f"Error in optimize_images: {str(e)}")
         return content
 
-def is_content_quality_good(content):
-    """Check if content quality is good"""
+def is_content_quality_good(content, analysis: Dict = None, accurate=False):
+    """Check if content quality is good (accurate=True uses the NLTK tokenizers for the text metrics)"""
     try:
-        # بررسی طول محتوا
-        word_count = len(content.split())
-        if word_count < 1000:  # حداقل طول محتوا
+        analysis = analysis or html_analysis.analyze_html(content)
+
+        # بررسی ساختار
+        if not analysis['headings']:  # وجود عنوان
             return False
-            
-        # بررسی خوانایی
-        sentences = sent_tokenize(content)
-        avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences)
-        if avg_sentence_length > 20:  # خوانایی
+        if not analysis['paragraphs']:  # وجود پاراگراف
             return False
-            
-        # بررسی تنوع کلمات
-        words = word_tokenize(content.lower())
-        unique_words = set(words)
-        if len(unique_words) / len(words) < 0.7:  # تنوع کلمات
+        if not analysis['lists']:  # وجود لیست
             return False
-            
-        # بررسی ساختار
-        if not re.search(r'<h[1-6]', content):  # وجود عنوان
+        if not analysis['blockquotes']:  # وجود نقل قول
             return False
-        if not re.search(r'<p', content):  # وجود پاراگراف
+        if not analysis['anchors']:  # وجود لینک
             return False
-        if not re.search(r'<ul|<ol', content):  # وجود لیست
+
+        # معیارهای متنی فقط روی متن قابل مشاهده
+        text = analysis['text']
+
+        stats = text_stats.compute_text_stats(text, accurate=accurate)
+
+        # بررسی طول محتوا
+        if stats.word_count < 1000:  # حداقل طول محتوا
             return False
-        if not re.search(r'<blockquote', content):  # وجود نقل قول
+
+        # بررسی خوانایی
+        if stats.average_sentence_length > 20:  # خوانایی
             return False
-        if not re.search(r'<a', content):  # وجود لینک
+
+        # بررسی تنوع کلمات
+        if stats.lexical_diversity < 0.7:  # تنوع کلمات
             return False
         
         return True
@@ -1211,20 +696,13 @@ def is_content_quality_good(content):
         return False
 
 def combine_content(current_content, new_content):
-    """Combine current content with new content"""
+    """Combine current content with new content, dropping repeated and near-duplicate sentences"""
     try:
-        # حذف محتوای تکراری
-        current_sentences = set(sent_tokenize(current_content))
-        new_sentences = sent_tokenize(new_content)
-        
-        # اضافه کردن جملات جدید
-        combined_content = current_content
-        for sentence in new_sentences:
-            if sentence not in current_sentences:
-                combined_content += "\n" + sentence
+        # حذف جمله‌های تکراری و تقریباً تکراری، با حفظ ساختار بلوک‌های محتوای جدید
+        new_blocks, word_count = similarity.merge_blocks(current_content, new_content)
+        combined_content = "\n".join([current_content, new_blocks])
         
         # بررسی طول محتوا
-        word_count = len(combined_content.split())
         if word_count < 1000:
             # اگر هنوز کوتاه است، محتوای جدید را کامل اضافه کنیم
             combined_content = new_content
@@ -1238,6 +716,115 @@ def combine_content(current_content, new_content):
         logging.error(f"Error in combine_content: {str(e)}")
         return current_content
 
+def prepare_content_row(job, render_options):
+    """Build metadata and scoring features for one TblPureContent row (features are None for cached scores)"""
+    content_id = job['id']
+    title = job['title']
+    description = job['description']
+
+    logging.info(f"\nپردازش محتوای {content_id}...")
+    logging.info(f"عنوان: {title}")
+
+    content_data = {
+        'id': content_id,
+        'title': title,
+        'description': description,
+        'content': description,
+        'category_id': job['category_id'],
+        'keywords': job['keywords'],
+        'linked_description': job.get('linked_description')
+    }
+
+    # Unchanged rows reuse the stored score and metadata; only the page may still need rendering
+    cached_score = job.get('cached_score')
+    if cached_score:
+        content_data['content'] = job.get('expanded_content') or description
+        return content_data, cached_score['seo_metadata'], None
+
+    # Generate SEO metadata with enhanced content
+    seo_metadata = generate_seo_metadata(content_data, render_options['stylesheet_href'], render_options['critical_css'])
+
+    # Update content with enhanced version, or with the AI expansion stored by a previous 'expand' run
+    content_data['content'] = job.get('expanded_content') or seo_metadata.get('enhanced_content', description)
+
+    return content_data, seo_metadata, extract_seo_features(content_data, seo_metadata)
+
+def finish_content_row(job, render_options, content_data, seo_metadata, seo_result):
+    """Render and write the page of a scored row and build its report entry"""
+    content_id = job['id']
+    title = job['title']
+    description = job['description']
+
+    content_result = {
+        'content_id': content_id,
+        'title': title,
+        'description': description[:200] + '...' if len(description) > 200 else description,
+        'category_id': job['category_id'],
+        'seo_metadata': seo_metadata,
+        'seo_score': seo_result['score'],
+        'grade': get_grade(seo_result['score']),
+        'issues': seo_result['issues'],
+        'suggestions': seo_result['suggestions'],
+        'keywords': content_data['keywords'],
+        'processed_at': datetime.datetime.now().isoformat()
+    }
+    if seo_result.get('needs_expansion') and not job.get('expanded_content'):
+        content_result['expansion_request'] = {
+            'title': seo_metadata.get('meta_title', ''),
+            'description': seo_metadata.get('meta_description', ''),
+            'content': content_data['content']
+        }
+
+    # Re-render and rewrite the HTML file only when its inputs changed; this comes last so a row that
+    # fails above never leaves behind a page the manifest does not know about
+    html_hash = None
+    if job['render']:
+        if render_options.get('images') and title:
+            # Image files come from the run's ImageBatch; the worker only builds the markup
+            content_data['hero'] = get_image_html(title, create=False)
+        html_content = convert_to_html(content_data, title, description,
+                                       render_options['stylesheet_href'], render_options['critical_css'])
+        if html_content and write_html_file(html_content, content_id):
+            html_hash = build_manifest.output_hash(html_content)
+    return content_result, html_hash
+
+def process_content_batch(jobs, render_options):
+    """
+    Score and render a batch of rows; pure CPU work, so batches can run in worker processes.
+    All rows of the batch that have no cached score are scored together in one vectorized rule evaluation.
+    Failed rows come back as None so the batch keeps its order.
+    """
+    prepared = []
+    for job in jobs:
+        try:
+            prepared.append(prepare_content_row(job, render_options))
+        except Exception as e:
+            logging.error(f"❌ خطا در پردازش محتوای {job['id']}: {str(e)}")
+            prepared.append(None)
+
+    try:
+        scored = iter(calculate_seo_scores([row[2] for row in prepared if row and row[2] is not None]))
+    except Exception as e:
+        logging.error(f"Error in calculate_seo_scores: {str(e)}")
+        scored = iter([])
+
+    outcomes = []
+    for job, row in zip(jobs, prepared):
+        if row is None:
+            outcomes.append(None)
+            continue
+        try:
+            content_data, seo_metadata, features = row
+            if features is None:
+                seo_result = job['cached_score']
+            else:
+                seo_result = next(scored, None) or calculate_seo_score(content_data, seo_metadata)
+            outcomes.append(finish_content_row(job, render_options, content_data, seo_metadata, seo_result))
+        except Exception as e:
+            logging.error(f"❌ خطا در پردازش محتوای {job['id']}: {str(e)}")
+            outcomes.append(None)
+    return outcomes
+
 def get_user_content():
     """Get content from user and optimize it"""
     try:
@@ -1275,7 +862,78 @@ def get_user_content():
         print(f"❌ خطا در دریافت متن: {str(e)}")
         return None
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SEO analysis for TblPureContent")
+    parser.add_argument('command', nargs='?', default='run', choices=['run', 'prepare', 'expand', 'summary', 'images', 'dedupe'],
+                        help="run: analyze content (default); prepare: pre-fetch NLTK data; "
+                             "expand: AI-expand short content queued by previous runs; "
+                             "summary: print score statistics from the score store; "
+                             "images: generate hero images for every row; "
+                             "dedupe: report near-duplicate descriptions")
+    parser.add_argument('--css', default='inline', choices=['inline', 'external'],
+                        help="inline: CSS in every page; external: one fingerprinted styles.<hash>.css per run")
+    parser.add_argument('--critical-css', action='store_true',
+                        help="with --css external, also inline the small critical CSS in every page")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes for scoring, rendering and images (default: 1)")
+    parser.add_argument('--batch-size', type=int, default=10,
+                        help="rows per batch handed to a worker")
+    parser.add_argument('--precompress', action='store_true',
+                        help="write .gz (and .br when brotli is installed) next to changed pages")
+    parser.add_argument('--images', action='store_true',
+                        help="add a <picture> hero image (AVIF/WebP/JPEG, srcset) to every rendered page")
+    parser.add_argument('--expand-workers', type=int, default=2,
+                        help="concurrent AI requests for the expand command")
+    parser.add_argument('--expand-limit', type=int, default=None,
+                        help="maximum queued items to expand in one expand run")
+    parser.add_argument('--force', action='store_true',
+                        help="re-score and re-render every row even if its inputs did not change")
+    parser.add_argument('--skip-duplicates', action='store_true',
+                        help="only analyze and render one representative per near-duplicate cluster")
+    parser.add_argument('--nltk-dir', default=NLTK_DATA_DIR,
+                        help="local NLTK data directory (filled by prepare, read by run)")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
+    args = parse_args()
+    configure_logging()
+    use_nltk_data_dir(args.nltk_dir)
+
+    if args.command == 'prepare':
+        logging.info(f"✅ داده‌های NLTK در {prepare_nltk_data(args.nltk_dir)} آماده شد.")
+        sys.exit(0)
+
+    if args.command == 'expand':
+        expansion_store = expansion.ExpansionStore(EXPANSION_STORE_PATH)
+        try:
+            done, total = expansion.run_expansion_queue(
+                expansion_store, expand_content,
+                max_workers=args.expand_workers, limit=args.expand_limit
+            )
+            logging.info(f"✅ {done} از {total} محتوای صف گسترش یافت.")
+        finally:
+            expansion_store.close()
+        sys.exit(0)
+
+    if args.command == 'summary':
+        score_store = scores.ScoreStore(SCORE_STORE_PATH, rules.RULESET_VERSION)
+        try:
+            stored = score_store.summary()
+        finally:
+            score_store.close()
+        logging.info("\n📊 خلاصه نتایج ذخیره شده:")
+        logging.info(f"محتوای امتیازدهی شده: {stored['processed_content']}")
+        if stored['processed_content']:
+            logging.info(f"میانگین امتیاز: {stored['average_score']:.1f}")
+            logging.info(f"بالاترین امتیاز: {stored['highest_score']}")
+            logging.info(f"پایین‌ترین امتیاز: {stored['lowest_score']}")
+            logging.info("\n📈 توزیع نمرات:")
+            for grade, count in stored['grade_distribution'].items():
+                logging.info(f"{grade}: {count} محتوا")
+        sys.exit(0)
+
+    from content_manager.content_database import ContentDatabase
+
     SERVER = "45.149.76.141"
     DATABASE = "ContentGenerator"
     USERNAME = "admin"
@@ -1308,133 +966,182 @@ if __name__ == "__main__":
         
         if not results:
             logging.info("هیچ محتوایی یافت نشد.")
+        elif args.command == 'images':
+            generate_content_images(results, workers=args.workers)
+        elif args.command == 'dedupe':
+            write_near_duplicate_report(find_near_duplicates(results), len(results))
         else:
+            if args.skip_duplicates:
+                duplicate_ids = {content_id for cluster in find_near_duplicates(results) for content_id in cluster[1:]}
+                results = [row for row in results if row[0] not in duplicate_ids]
+                logging.info(f"⏭️ {len(duplicate_ids)} محتوای تقریباً تکراری کنار گذاشته شد.")
+
             logging.info(f"در حال پردازش {len(results)} محتوا...")
 
-            seo_analysis = {
-                'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'total_content': len(results),
-                'average_score': 0,
-                'content_results': []
+            # Report rows are streamed to a JSONL file as they finish; summary statistics are kept online
+            report_file = os.path.join(OUTPUT_DIR, f"seo_analysis_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+            os.makedirs(OUTPUT_DIR, exist_ok=True)
+            report_writer = report.StreamingReportWriter(report_file, len(results))
+
+            # Shared stylesheet written once per run instead of inlined in every page
+            stylesheet_href = assets.write_stylesheet(OUTPUT_DIR) if args.css == 'external' else None
+
+            # TF-IDF keywords for the whole table in one vectorized pass
+            corpus_keywords = extract_corpus_keywords({row[0]: row[2] for row in results})
+
+            # Internal links to other pages and categories, found with one Aho-Corasick scan per description
+            link_targets = {title: os.path.basename(html_file_path(content_id)) for content_id, title, _, _ in results if title}
+            for _, category_title in content_db.get_category() or []:
+                link_targets.setdefault(category_title, rewriter.topic_href(category_title))
+            link_automaton = internal_links.get_automaton(link_targets)
+
+            # AI expansions are produced by the separate 'expand' command and reused here
+            expansion_store = expansion.ExpansionStore(EXPANSION_STORE_PATH)
+
+            # Per-page build manifest for incremental regeneration
+            manifest = build_manifest.BuildManifest(os.path.join(OUTPUT_DIR, "build_manifest.json"))
+
+            # Stored scores keyed by content id, SEO input hash and rule-set version
+            score_store = scores.ScoreStore(SCORE_STORE_PATH, rules.RULESET_VERSION)
+            stored_scores = {} if args.force else score_store.load()
+
+            render_options = {
+                'stylesheet_href': stylesheet_href,
+                'critical_css': args.critical_css,
+                'images': args.images
             }
 
-            total_score = 0
-            scores = []  # Store all scores for min/max calculation
-
-            # Process content in batches
-            batch_size = 10
-            for i in range(0, len(results), batch_size):
-                batch = results[i:i + batch_size]
-                logging.info(f"پردازش دسته {i//batch_size + 1} از {(len(results) + batch_size - 1)//batch_size}")
-
-                for row in batch:
-                    content_id = row[0]
-                    title = row[1]
-                    description = row[2]
-                    category_id = row[3]
-
-                    logging.info(f"\nپردازش محتوای {content_id}...")
-                    logging.info(f"عنوان: {title}")
-
-                    try:
-                        content_data = {
-                            'id': content_id,
-                            'title': title,
-                            'description': description,
-                            'content': description,
-                            'category_id': category_id
-                        }
-
-                        # Generate SEO metadata with enhanced content
-                        seo_metadata = generate_seo_metadata(content_data)
-
-                        # Update content with enhanced version
-                        content_data['content'] = seo_metadata.get('enhanced_content', description)
-
-                        # Calculate SEO score
-                        seo_result = calculate_seo_score(content_data, seo_metadata)
-
-                        # Convert content to HTML and save as file
-                        html_content = convert_to_html(content_data, title, description)
-                        content_data['content'] = html_content
-
-                        # Save HTML file
-                        html_file = save_html_file(content_data, title, description, content_id)
-                        if html_file:
-                            content_data['html_file'] = html_file
-
-                        # Add to results
-                        content_result = {
-                            'content_id': content_id,
-                            'title': title,
-                            'description': description[:200] + '...' if len(description) > 200 else description,
-                            'category_id': category_id,
-                            'seo_metadata': seo_metadata,
-                            'seo_score': seo_result['score'],
-                            'grade': get_grade(seo_result['score']),
-                            'issues': seo_result['issues'],
-                            'suggestions': seo_result['suggestions'],
-                            'keywords': extract_keywords(description),
-                            'processed_at': datetime.datetime.now().isoformat()
-                        }
-
-                        seo_analysis['content_results'].append(content_result)
-                        total_score += seo_result['score']
-                        scores.append(seo_result['score'])
+            jobs = []
+            for content_id, title, description, category_id in results:
+                keywords = corpus_keywords.get(content_id) or extract_keywords(description)
+                linked_description = description and link_internal_mentions(description, link_automaton, content_id)
+                input_hash = build_manifest.content_input_hash(
+                    title, description, category_id, keywords,
+                    stylesheet_href, args.critical_css, linked_description,
+                    args.images and images.STYLE_VERSION
+                )
+                expansion_hash = build_manifest.content_input_hash(title, description)
+                expanded_content = expansion_store.get_expanded(content_id, expansion_hash)
+                score_hash = build_manifest.content_input_hash(input_hash, expanded_content, templates.TEMPLATE_VERSION)
+                stored_hash, cached_score = stored_scores.get(str(content_id), (None, None))
+                jobs.append({
+                    'id': content_id,
+                    'title': title,
+                    'description': description,
+                    'category_id': category_id,
+                    'keywords': keywords,
+                    'linked_description': linked_description,
+                    'input_hash': input_hash,
+                    'expansion_hash': expansion_hash,
+                    'expanded_content': expanded_content,
+                    'score_hash': score_hash,
+                    'cached_score': cached_score if stored_hash == score_hash else None,
+                    'render': args.force or not manifest.is_current(content_id, input_hash, html_file_path(content_id))
+                })
+
+            cached_count = sum(1 for job in jobs if job['cached_score'])
+            if cached_count:
+                logging.info(f"♻️ امتیاز {cached_count} محتوا از مخزن امتیازها خوانده شد.")
+
+            # Process content in batches; with --workers > 1 batches are fanned out to a process pool
+            batch_size = args.batch_size
+            batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+            executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+
+            # Hero images of every page to be rendered are generated in their own pool alongside the HTML
+            image_batch = None
+            if args.images:
+                image_batch = image_store.ImageBatch(image_store.ImageStore(os.path.join(OUTPUT_DIR, "images")), args.workers)
+                image_batch.submit((job['title'], 800, 400) for job in jobs if job['render'] and job['title'])
+            try:
+                if executor:
+                    batch_outcomes = executor.map(process_content_batch, batches, repeat(render_options))
+                else:
+                    batch_outcomes = (process_content_batch(batch, render_options) for batch in batches)
+
+                # map() yields batches in submission order, so results stay in Id order
+                for batch_number, (batch, outcomes) in enumerate(zip(batches, batch_outcomes), 1):
+                    logging.info(f"پردازش دسته {batch_number} از {len(batches)}")
+
+                    new_scores = []
+                    for job, outcome in zip(batch, outcomes):
+                        if outcome is None:
+                            continue
+                        content_result, html_hash = outcome
+                        content_id = job['id']
+
+                        if not job['cached_score']:
+                            new_scores.append((content_id, job['score_hash'], content_result))
+
+                        expansion_request = content_result.pop('expansion_request', None)
+                        if expansion_request:
+                            expansion_store.enqueue(content_id, job['expansion_hash'], **expansion_request)
+
+                        if html_hash and image_batch and job['title']:
+                            # A page is recorded only once its hero image exists, so a failed image is retried next run
+                            try:
+                                image_batch.get(job['title'])
+                            except Exception as e:
+                                logging.error(f"❌ خطا در ساخت تصویر برای: {job['title']}: {str(e)}")
+                                html_hash = None
+
+                        if html_hash:
+                            manifest.record(content_id, job['input_hash'], html_hash)
+                        elif not job['render']:
+                            logging.info(f"⏭️ صفحه‌ی محتوای {content_id} تغییری نکرده است.")
+
+                        report_writer.write(content_result)
 
                         logging.info(f"✅ محتوای {content_id} با موفقیت پردازش شد.")
-                        logging.info(f"امتیاز SEO: {seo_result['score']}/100 (رتبه {get_grade(seo_result['score'])})")
+                        logging.info(f"امتیاز SEO: {content_result['seo_score']}/100 (رتبه {content_result['grade']})")
 
-                        if seo_result['issues']:
+                        if content_result['issues']:
                             logging.info("\nمشکلات:")
-                            for category, category_issues in seo_result['issues'].items():
+                            for category, category_issues in content_result['issues'].items():
                                 if category_issues:
                                     logging.info(f"\n{category.upper()}:")
                                     for issue in category_issues:
                                         logging.info(f"- {issue}")
 
-                        if seo_result['suggestions']:
+                        if content_result['suggestions']:
                             logging.info("\nپیشنهادات:")
-                            for suggestion in seo_result['suggestions']:
+                            for suggestion in content_result['suggestions']:
                                 logging.info(f"- {suggestion['text']}")
 
-                    except Exception as e:
-                        logging.error(f"❌ خطا در پردازش محتوای {content_id}: {str(e)}")
-                        continue
-
-            if seo_analysis['content_results']:
-                # Calculate statistics
-                seo_analysis['average_score'] = total_score / len(seo_analysis['content_results'])
-                seo_analysis['highest_score'] = max(scores)
-                seo_analysis['lowest_score'] = min(scores)
-
-                # Sort results by score
-                seo_analysis['content_results'].sort(key=lambda x: x['seo_score'], reverse=True)
-
-                # Save JSON results in output directory
-                json_file = os.path.join("output", f"seo_analysis_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-                with open(json_file, 'w', encoding='utf-8') as f:
-                    json.dump(seo_analysis, f, ensure_ascii=False, indent=2)
-
+                    manifest.save()
+                    score_store.put_many(new_scores)
+            finally:
+                if executor:
+                    executor.shutdown()
+                if image_batch:
+                    image_batch.close()
+                report_writer.close()
+                expansion_store.close()
+                score_store.close()
+
+            # Pre-compressed siblings (.html.gz / .html.br) so the web server does not compress per request
+            if args.precompress:
+                static_files = [html_file_path(job['id']) for job in jobs]
+                if stylesheet_href:
+                    static_files.append(os.path.join(OUTPUT_DIR, stylesheet_href))
+                compressed = compression.precompress_files(static_files, workers=args.workers)
+                logging.info(f"🗜️ {len(compressed)} فایل فشرده ساخته شد.")
+
+            summary = report_writer.summary
+            if summary.count:
                 logging.info(f"\n✅ تحلیل SEO با موفقیت انجام شد.")
-                logging.info(f"نتایج در فایل {json_file} ذخیره شد.")
+                logging.info(f"نتایج در فایل {report_file} ذخیره شد.")
 
                 logging.info("\n📊 خلاصه نتایج:")
                 logging.info(f"تعداد کل محتوا: {len(results)}")
-                logging.info(f"محتوای پردازش شده: {len(seo_analysis['content_results'])}")
-                logging.info(f"میانگین امتیاز: {seo_analysis['average_score']:.1f}")
-                logging.info(f"بالاترین امتیاز: {seo_analysis['highest_score']}")
-                logging.info(f"پایین‌ترین امتیاز: {seo_analysis['lowest_score']}")
-
-                # Print grade distribution
-                grade_distribution = {}
-                for result in seo_analysis['content_results']:
-                    grade = result['grade']
-                    grade_distribution[grade] = grade_distribution.get(grade, 0) + 1
+                logging.info(f"محتوای پردازش شده: {summary.count}")
+                logging.info(f"میانگین امتیاز: {summary.average_score:.1f}")
+                logging.info(f"بالاترین امتیاز: {summary.highest_score}")
+                logging.info(f"پایین‌ترین امتیاز: {summary.lowest_score}")
 
                 logging.info("\n📈 توزیع نمرات:")
-                for grade in ['A', 'B', 'C', 'D', 'F']:
-                    count = grade_distribution.get(grade, 0)
+                for grade in report.GRADES:
+                    count = summary.grade_distribution.get(grade, 0)
                     logging.info(f"{grade}: {count} محتوا")
 
                 # Print improvement suggestions
@@ -0,0 +1,145 @@
+import hashlib
+import os
+from functools import lru_cache
+
+ARTICLE_CSS = """body {
+    font-family: Arial, sans-serif;
+    line-height: 1.6;
+    color: #333;
+    max-width: 1200px;
+    margin: 0 auto;
+    padding: 20px;
+}
+
+h1, h2, h3 {
+    color: #2c3e50;
+    margin-top: 30px;
+}
+
+h1 {
+    font-size: 2.5em;
+    border-bottom: 2px solid #3498db;
+    padding-bottom: 10px;
+}
+
+h2 {
+    font-size: 1.8em;
+    color: #2980b9;
+}
+
+h3 {
+    font-size: 1.4em;
+    color: #34495e;
+}
+
+p {
+    margin-bottom: 20px;
+    font-size: 1.1em;
+}
+
+ul, ol {
+    margin-bottom: 20px;
+    padding-left: 20px;
+}
+
+li {
+    margin-bottom: 10px;
+}
+
+a {
+    color: #3498db;
+    text-decoration: none;
+}
+
+a:hover {
+    text-decoration: underline;
+}
+
+section {
+    margin-bottom: 40px;
+    padding: 20px;
+    background: #fff;
+    border-radius: 5px;
+    box-shadow: 0 2px 5px rgba(0,0,0,0.05);
+}
+
+.content-section {
+    background: #f8f9fa;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.05);
+}
+
+.table-of-contents {
+    background: #f8f9fa;
+    padding: 20px;
+    border-radius: 5px;
+    margin: 20px 0;
+}
+
+.table-of-contents ul {
+    list-style-type: none;
+    padding: 0;
+}
+
+.table-of-contents li {
+    margin: 10px 0;
+}
+
+@media (max-width: 768px) {
+    body {
+        padding: 10px;
+    }
+
+    h1 {
+        font-size: 2em;
+    }
+
+    h2 {
+        font-size: 1.5em;
+    }
+
+    h3 {
+        font-size: 1.2em;
+    }
+
+    p {
+        font-size: 1em;
+    }
+}
+"""
+
+# Above-the-fold rules inlined per page so the first paint does not wait for the stylesheet
+CRITICAL_CSS = (
+    "body{font-family:Arial,sans-serif;line-height:1.6;color:#333;max-width:1200px;margin:0 auto;padding:20px}"
+    "h1{font-size:2.5em;color:#2c3e50;border-bottom:2px solid #3498db;padding-bottom:10px}"
+    "@media (max-width:768px){body{padding:10px}h1{font-size:2em}}"
+)
+
+
+def stylesheet_name(css=ARTICLE_CSS):
+    """نام فایل CSS با اثرانگشت محتوا (styles.<hash>.css) تا مرورگر بتواند برای همیشه کش کند"""
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]
+    return f"styles.{digest}.css"
+
+
+def write_stylesheet(output_dir, css=ARTICLE_CSS):
+    """نوشتن stylesheet مشترک یک بار در هر اجرا؛ اگر همان نسخه موجود باشد دوباره نوشته نمی‌شود"""
+    name = stylesheet_name(css)
+    path = os.path.join(output_dir, name)
+    if not os.path.exists(path):
+        os.makedirs(output_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(css)
+        os.replace(tmp_path, path)
+    return name
+
+
+@lru_cache(maxsize=16)
+def style_tags(stylesheet_href=None, inline_critical=False):
+    """تگ‌های CSS صفحه: CSS کامل inline (حالت قدیمی) یا لینک به stylesheet مشترک"""
+    if not stylesheet_href:
+        return f"<style>\n{ARTICLE_CSS}</style>"
+    tags = f'<link rel="stylesheet" href="{stylesheet_href}">'
+    if inline_critical:
+        tags = f"<style>{CRITICAL_CSS}</style>\n    {tags}"
+    return tags
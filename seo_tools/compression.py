@@ -0,0 +1,58 @@
+import gzip
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def _is_fresh(source_stat, target):
+    """sibling فشرده فقط وقتی معتبر است که زمان تغییرش با فایل اصلی یکی باشد"""
+    try:
+        return os.stat(target).st_mtime_ns == source_stat.st_mtime_ns
+    except OSError:
+        return False
+
+
+def _atomic_write(path, data, source_stat):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.utime(tmp_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    os.replace(tmp_path, path)
+
+
+def precompress_file(path):
+    """ساخت .gz (و .br در صورت نصب بودن brotli) کنار فایل؛ فقط وقتی فایل اصلی تغییر کرده باشد"""
+    source_stat = os.stat(path)
+    targets = [(f"{path}.gz", lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))]
+    if brotli is not None:
+        targets.append((f"{path}.br", lambda data: brotli.compress(data, quality=BROTLI_QUALITY)))
+
+    written = []
+    data = None
+    for target, compress in targets:
+        if _is_fresh(source_stat, target):
+            continue
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        _atomic_write(target, compress(data), source_stat)
+        written.append(target)
+    return written
+
+
+def precompress_files(paths, workers=1):
+    """فشرده‌سازی گروهی فایل‌ها، در صورت نیاز با چند پردازه"""
+    paths = [path for path in paths if path and os.path.exists(path)]
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(precompress_file, paths, chunksize=16))
+    else:
+        results = [precompress_file(path) for path in paths]
+    return [target for written in results for target in written]
@@ -0,0 +1,115 @@
+import datetime
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MAX_ATTEMPTS = 3
+
+
+class ExpansionStore:
+    """
+    صف و مخزن گسترش محتوا با هوش مصنوعی (SQLite).
+    مرحله‌ی امتیازدهی فقط سطرهای کوتاه را در صف می‌گذارد و نتیجه‌ی گسترش در اجرای بعدی استفاده می‌شود.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS expansions (
+                content_id TEXT PRIMARY KEY,
+                input_hash TEXT NOT NULL,
+                status TEXT NOT NULL,
+                title TEXT,
+                description TEXT,
+                content TEXT,
+                expanded_content TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT
+            )
+        """)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def get_expanded(self, content_id, input_hash):
+        """محتوای گسترش یافته، اگر برای همین نسخه‌ی ورودی آماده باشد"""
+        row = self.connection.execute(
+            "SELECT expanded_content FROM expansions WHERE content_id = ? AND input_hash = ? AND status = 'done'",
+            (str(content_id), input_hash)
+        ).fetchone()
+        return row[0] if row else None
+
+    def enqueue(self, content_id, input_hash, title, description, content):
+        """اضافه کردن به صف؛ اگر همین نسخه قبلا در صف یا انجام شده باشد کاری نمی‌کند"""
+        self.connection.execute("""
+            INSERT INTO expansions (content_id, input_hash, status, title, description, content, attempts, updated_at)
+            VALUES (?, ?, 'pending', ?, ?, ?, 0, ?)
+            ON CONFLICT(content_id) DO UPDATE SET
+                input_hash = excluded.input_hash,
+                status = 'pending',
+                title = excluded.title,
+                description = excluded.description,
+                content = excluded.content,
+                expanded_content = NULL,
+                attempts = 0,
+                updated_at = excluded.updated_at
+            WHERE expansions.input_hash != excluded.input_hash
+        """, (str(content_id), input_hash, title, description, content, datetime.datetime.now().isoformat()))
+        self.connection.commit()
+
+    def pending(self, limit=None):
+        query = """
+            SELECT content_id, title, description, content
+            FROM expansions
+            WHERE status = 'pending' AND attempts < ?
+            ORDER BY updated_at
+        """
+        params = [MAX_ATTEMPTS]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self.connection.execute(query, params).fetchall()
+
+    def mark_done(self, content_id, expanded_content):
+        self.connection.execute(
+            "UPDATE expansions SET status = 'done', expanded_content = ?, updated_at = ? WHERE content_id = ?",
+            (expanded_content, datetime.datetime.now().isoformat(), str(content_id))
+        )
+        self.connection.commit()
+
+    def mark_failed(self, content_id):
+        self.connection.execute(
+            "UPDATE expansions SET attempts = attempts + 1, updated_at = ? WHERE content_id = ?",
+            (datetime.datetime.now().isoformat(), str(content_id))
+        )
+        self.connection.commit()
+
+
+def run_expansion_queue(store, expand, max_workers=2, limit=None):
+    """
+    اجرای صف گسترش با حداکثر max_workers درخواست همزمان.
+    expand(title, description, content) متن گسترش یافته یا None برمی‌گرداند.
+    نتایج در همین thread در SQLite ثبت می‌شوند.
+    """
+    jobs = store.pending(limit)
+    done = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(expand, title, description, content): content_id
+            for content_id, title, description, content in jobs
+        }
+        for future in as_completed(futures):
+            content_id = futures[future]
+            try:
+                expanded_content = future.result()
+            except Exception:
+                expanded_content = None
+            if expanded_content:
+                store.mark_done(content_id, expanded_content)
+                done += 1
+            else:
+                store.mark_failed(content_id)
+    return done, len(jobs)
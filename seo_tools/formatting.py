@@ -0,0 +1,118 @@
+import re
+
+# عنوان‌های پیش‌فرض که به ترتیب قبل از لیست‌ها، نکته‌ها و هر سه پاراگراف اضافه می‌شوند
+DEFAULT_SECTIONS = (
+    "مقدمه",
+    "نکات کلیدی",
+    "مزایا و ویژگی‌ها",
+    "نحوه استفاده",
+    "بهترین شیوه‌ها",
+    "سوالات متداول",
+    "مطالعات موردی",
+    "منابع بیشتر",
+    "نتیجه‌گیری",
+)
+
+NOTE_MARKERS = ('نکته:', 'توجه:', 'مهم:', 'هشدار:')
+
+HEADING_RE = re.compile(r'^(#{1,6})#*\s*(.*?)\s*$')
+BULLET_RE = re.compile(r'^\s*[-*]\s+')
+NUMBERED_RE = re.compile(r'^\s*\d+[.)]\s*')
+QUOTE_RE = re.compile(r'^\s*>\s?')
+SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?؟])\s+')
+NOTE_RE = re.compile('|'.join(re.escape(marker) for marker in NOTE_MARKERS))
+
+HEADING = 'heading'
+BULLET_LIST = 'bullet_list'
+NUMBERED_LIST = 'numbered_list'
+QUOTE = 'quote'
+NOTE = 'note'
+PARAGRAPH = 'paragraph'
+
+
+def _classify(lines):
+    first = lines[0]
+    if BULLET_RE.match(first):
+        return BULLET_LIST, [BULLET_RE.sub('', line, count=1) for line in lines]
+    if NUMBERED_RE.match(first):
+        return NUMBERED_LIST, [NUMBERED_RE.sub('', line, count=1) for line in lines]
+    if QUOTE_RE.match(first):
+        return QUOTE, '\n'.join(QUOTE_RE.sub('', line, count=1) for line in lines).strip()
+    text = '\n'.join(lines)
+    if NOTE_RE.search(text):
+        return NOTE, text
+    return PARAGRAPH, text
+
+
+def tokenize_blocks(content):
+    """
+    تقسیم متن markdown-مانند به بلوک‌ها در یک گذر روی خطوط.
+    خروجی: (نوع بلوک، داده) که داده برای عنوان (سطح، متن)، برای لیست‌ها لیست آیتم‌ها و در بقیه متن است.
+    """
+    block = []
+    for line in content.split('\n'):
+        if not line.strip():
+            if block:
+                yield _classify(block)
+                block = []
+            continue
+        if line.startswith('#'):
+            if block:
+                yield _classify(block)
+                block = []
+            level, title = HEADING_RE.match(line).groups()
+            yield HEADING, (len(level), title)
+            continue
+        block.append(line)
+    if block:
+        yield _classify(block)
+
+
+def split_sentences(text):
+    """تقسیم پاراگراف به جمله‌ها؛ علامت پایان جمله حفظ می‌شود"""
+    return [sentence.strip() for sentence in SENTENCE_BOUNDARY_RE.split(text) if sentence.strip()]
+
+
+def format_blocks(content, default_sections=DEFAULT_SECTIONS):
+    """تبدیل متن به HTML با یک گذر روی بلوک‌ها و ساختن خروجی با یک ''.join"""
+    parts = []
+    current_section = 0
+    paragraph_count = 0
+
+    def section_heading(tag, css_class):
+        nonlocal current_section
+        if current_section < len(default_sections):
+            parts.append(f'<{tag} class="{css_class}">{default_sections[current_section]}</{tag}>\n')
+            current_section += 1
+
+    for kind, data in tokenize_blocks(content):
+        if kind == HEADING:
+            level, title = data
+            parts.append(f'<h{level} class="section-title">{title}</h{level}>\n')
+        elif kind == BULLET_LIST:
+            section_heading('h2', 'section-heading')
+            parts.append('<ul class="feature-list">\n')
+            parts.extend(f'<li class="list-item">{item}</li>\n' for item in data if item.strip())
+            parts.append('</ul>\n')
+        elif kind == NUMBERED_LIST:
+            section_heading('h2', 'section-heading')
+            parts.append('<ol class="step-list">\n')
+            parts.extend(f'<li class="step-item">{item}</li>\n' for item in data if item.strip())
+            parts.append('</ol>\n')
+        elif kind == QUOTE:
+            parts.append(f'<blockquote class="expert-quote">{data}</blockquote>\n')
+        elif kind == NOTE:
+            section_heading('h3', 'subsection-heading')
+            parts.append(f'<div class="important-note">{data}</div>\n')
+        else:
+            # هر 3 پاراگراف یک تیتر H2 اضافه کن
+            if paragraph_count % 3 == 0:
+                section_heading('h2', 'section-heading')
+            # هر جمله یک پاراگراف کوتاه برای خوانایی بهتر
+            for sentence in split_sentences(data):
+                if sentence[-1] not in '.!?؟':
+                    sentence += '.'
+                parts.append(f'<p class="content-paragraph">{sentence}</p>\n')
+                paragraph_count += 1
+
+    return ''.join(parts)
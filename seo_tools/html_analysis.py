@@ -0,0 +1,96 @@
+from html.parser import HTMLParser
+
+EXTERNAL_LINK_PREFIXES = ('http', 'https', '//')
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+LIST_TAGS = frozenset(['ul', 'ol'])
+INVISIBLE_TAGS = frozenset(['script', 'style', 'template', 'noscript'])
+
+
+class HtmlStructureAnalyzer(HTMLParser):
+    """
+    یک پیمایش روی سند HTML که همه‌ی چیزهایی که توابع امتیازدهی لازم دارند را جمع می‌کند:
+    لینک‌ها، viewport/canonical/schema، تعداد تیترها و پاراگراف‌ها و لیست‌ها و متن قابل مشاهده.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.internal_links = []
+        self.external_links = []
+        self.has_schema_markup = False
+        self.has_meta_viewport = False
+        self.has_canonical = False
+        self.headings = 0
+        self.paragraphs = 0
+        self.lists = 0
+        self.blockquotes = 0
+        self.anchors = 0
+        self._text = []
+        self._invisible_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+
+        if 'itemtype' in attributes:
+            self.has_schema_markup = True
+
+        if tag == 'a':
+            self.anchors += 1
+            href = attributes.get('href')
+            if href:
+                if href.startswith(EXTERNAL_LINK_PREFIXES):
+                    self.external_links.append(href)
+                else:
+                    self.internal_links.append(href)
+        elif tag == 'p':
+            self.paragraphs += 1
+        elif tag in HEADING_TAGS:
+            self.headings += 1
+        elif tag in LIST_TAGS:
+            self.lists += 1
+        elif tag == 'blockquote':
+            self.blockquotes += 1
+        elif tag == 'meta':
+            if any(value and 'viewport' in value.lower() for value in attributes.values()):
+                self.has_meta_viewport = True
+        elif tag == 'link':
+            if (attributes.get('rel') or '').lower() == 'canonical':
+                self.has_canonical = True
+        elif tag in INVISIBLE_TAGS:
+            self._invisible_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag in INVISIBLE_TAGS:
+            self._invisible_depth -= 1
+
+    def handle_endtag(self, tag):
+        if tag in INVISIBLE_TAGS and self._invisible_depth:
+            self._invisible_depth -= 1
+
+    def handle_data(self, data):
+        if not self._invisible_depth:
+            self._text.append(data)
+
+    def result(self, content_length):
+        return {
+            'internal_links': self.internal_links,
+            'external_links': self.external_links,
+            'has_schema_markup': self.has_schema_markup,
+            'has_meta_viewport': self.has_meta_viewport,
+            'has_canonical': self.has_canonical,
+            'headings': self.headings,
+            'paragraphs': self.paragraphs,
+            'lists': self.lists,
+            'blockquotes': self.blockquotes,
+            'anchors': self.anchors,
+            'text': ' '.join(self._text),
+            'length': content_length,
+        }
+
+
+def analyze_html(content):
+    """تحلیل یک‌باره‌ی سند؛ خروجی بین analyze_content_structure و is_content_quality_good مشترک است"""
+    analyzer = HtmlStructureAnalyzer()
+    analyzer.feed(content)
+    analyzer.close()
+    return analyzer.result(len(content))
@@ -0,0 +1,203 @@
+import hashlib
+import html
+import os
+import tempfile
+from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+
+from seo_tools import images, templates
+
+DEFAULT_IMAGE_DIR = os.path.join("output", "images")
+
+# Responsive widths as fractions of the requested width (largest last)
+SRCSET_SCALES = (0.5, 1.0)
+
+# (format, extension, MIME type, save options); JPEG is the <img> fallback and is always written
+FORMATS = (
+    ('AVIF', 'avif', 'image/avif', {'quality': 60}),
+    ('WEBP', 'webp', 'image/webp', {'quality': 80, 'method': 4}),
+    ('JPEG', 'jpg', 'image/jpeg', {'quality': 85, 'optimize': True, 'progressive': True}),
+)
+
+ImageAsset = namedtuple('ImageAsset', ['key', 'width', 'height', 'variants'])
+
+
+def image_key(text, width, height):
+    """کلید محتوایی تصویر: hash متن، اندازه و نسخه‌ی سبک"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{images.STYLE_VERSION}\0{width}x{height}\0".encode('utf-8'))
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def available_formats():
+    """فرمت‌هایی که Pillow نصب شده می‌تواند بنویسد"""
+    from PIL import features
+
+    return [fmt for fmt in FORMATS if fmt[0] == 'JPEG' or features.check(fmt[0].lower())]
+
+
+class ImageStore:
+    """
+    مخزن تصاویر آدرس‌دهی شده با محتوا؛ تصویری که قبلاً با همان متن و اندازه ساخته شده دوباره ساخته نمی‌شود.
+    برای هر تصویر نسخه‌های AVIF/WebP (در صورت پشتیبانی) و JPEG در چند عرض نوشته می‌شود.
+    """
+
+    def __init__(self, directory=DEFAULT_IMAGE_DIR, scales=SRCSET_SCALES):
+        self.directory = directory
+        self.scales = scales
+        self.formats = available_formats()
+
+    def _variants(self, key, width, height):
+        variants = {}
+        for _, extension, mime_type, _ in self.formats:
+            variants[mime_type] = [
+                (f"{key}-{int(width * scale)}.{extension}", int(width * scale), int(height * scale))
+                for scale in self.scales
+            ]
+        return variants
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def asset(self, text, width=800, height=400):
+        """ImageAsset برای متن و اندازه‌ی داده شده، بدون ساختن تصویر"""
+        key = image_key(text, width, height)
+        return ImageAsset(key, width, height, self._variants(key, width, height))
+
+    def is_stored(self, asset):
+        return all(
+            os.path.exists(self.path(filename))
+            for variant in asset.variants.values()
+            for filename, _, _ in variant
+        )
+
+    def get_or_create(self, text, width=800, height=400):
+        """بازگرداندن تصویر ذخیره شده یا ساختن آن در صورت نبود"""
+        asset = self.asset(text, width, height)
+        if self.is_stored(asset):
+            return asset
+
+        from PIL import Image
+
+        os.makedirs(self.directory, exist_ok=True)
+        image = images.render_placeholder(text, width, height)
+        for scale in self.scales:
+            scaled = image if scale == 1.0 else image.resize(
+                (int(width * scale), int(height * scale)), Image.Resampling.LANCZOS
+            )
+            for fmt, extension, _, options in self.formats:
+                self._save(scaled, self.path(f"{asset.key}-{scaled.width}.{extension}"), fmt, options)
+        return asset
+
+    def _save(self, image, path, fmt, options):
+        if os.path.exists(path):
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                image.save(f, format=fmt, **options)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def fallback_path(self, asset):
+        """مسیر JPEG با بیشترین عرض"""
+        return self.path(asset.variants['image/jpeg'][-1][0])
+
+
+def _render_image(directory, scales, text, width, height):
+    return ImageStore(directory, scales).get_or_create(text, width, height)
+
+
+class ImageBatch:
+    """
+    ساخت دسته‌ای تصاویر در یک process pool.
+    jobs لیستی از (متن، عرض، ارتفاع) است؛ تصاویر موجود در مخزن بدون ارسال به pool برگردانده می‌شوند
+    و مرحله‌ی HTML فقط منتظر تصاویری می‌ماند که با get درخواست می‌کند.
+    """
+
+    def __init__(self, store, workers=None):
+        self.store = store
+        self.workers = workers
+        self._executor = None
+        self._futures = {}
+        self._jobs = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+    def submit(self, jobs):
+        for text, width, height in jobs:
+            self._submit(text, width, height)
+
+    def _submit(self, text, width, height):
+        asset = self.store.asset(text, width, height)
+        future = self._futures.get(asset.key)
+        if future is None:
+            if self.store.is_stored(asset):
+                future = Future()
+                future.set_result(asset)
+            else:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                future = self._executor.submit(
+                    _render_image, self.store.directory, self.store.scales, text, width, height
+                )
+            self._futures[asset.key] = future
+            self._jobs[future] = (text, width, height)
+        return future
+
+    def get(self, text, width=800, height=400):
+        """منتظر ماندن فقط برای همین تصویر (در صورت نیاز آن را به pool می‌فرستد)"""
+        return self._submit(text, width, height).result()
+
+    def completed(self):
+        """بازگرداندن (job، ImageAsset یا None در صورت خطا) به ترتیب پایان ساخت"""
+        for future in as_completed(list(self._jobs)):
+            try:
+                asset = future.result()
+            except Exception:
+                asset = None
+            yield self._jobs[future], asset
+
+
+def generate_images(store, jobs, workers=None):
+    """ساخت همه‌ی تصاویر jobs در چند پردازه و بازگرداندن نتایج به محض آماده شدن"""
+    with ImageBatch(store, workers) as batch:
+        batch.submit(jobs)
+        yield from batch.completed()
+
+
+def picture_html(asset, alt, href_prefix="images/", sizes=None):
+    """تگ <picture> با srcset برای هر فرمت، JPEG به عنوان جایگزین و width/height برای جلوگیری از جابه‌جایی صفحه"""
+    sizes = sizes or f"(max-width: {asset.width}px) 100vw, {asset.width}px"
+
+    def srcset(variant):
+        return ', '.join(f"{href_prefix}{filename} {width}w" for filename, width, _ in variant)
+
+    sources = ''.join(
+        templates.PICTURE_SOURCE.render(type=mime_type, srcset=srcset(variant), sizes=sizes)
+        for mime_type, variant in asset.variants.items()
+        if mime_type != 'image/jpeg'
+    )
+    fallback = asset.variants['image/jpeg']
+    return templates.PICTURE.render(
+        sources=sources,
+        src=href_prefix + fallback[-1][0],
+        srcset=srcset(fallback),
+        sizes=sizes,
+        width=asset.width,
+        height=asset.height,
+        alt=html.escape(alt, quote=True),
+    )
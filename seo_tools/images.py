@@ -0,0 +1,83 @@
+from functools import lru_cache
+
+# Bump whenever the rendered look changes so stored images are regenerated
+STYLE_VERSION = 1
+
+FONT_NAME = "arial.ttf"
+FONT_SIZE = 40
+LINE_SPACING = 10
+TEXT_MARGIN = 40
+TEXT_COLOR = (255, 255, 255)
+GRADIENT_START = (100, 150, 200)
+GRADIENT_SPAN = 100
+
+
+@lru_cache(maxsize=32)
+def get_font(size=FONT_SIZE):
+    """فونت‌ها یک بار در هر پردازه بارگذاری می‌شوند"""
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype(FONT_NAME, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=16)
+def gradient_background(width, height):
+    """پس‌زمینه‌ی گرادیانی عمودی که یک‌جا به صورت آرایه‌ی NumPy ساخته می‌شود (برای هر اندازه کش می‌شود)"""
+    import numpy as np
+    from PIL import Image
+
+    offsets = np.arange(height, dtype=np.int32) * GRADIENT_SPAN // height
+    column = np.clip(offsets[:, None] + np.asarray(GRADIENT_START, dtype=np.int32), 0, 255).astype(np.uint8)
+    pixels = np.ascontiguousarray(np.broadcast_to(column[:, None, :], (height, width, 3)))
+    return Image.fromarray(pixels, 'RGB')
+
+
+def wrap_text(text, font, max_width):
+    """شکستن متن به خطوط با اندازه‌گیری هر کلمه فقط یک بار"""
+    space_width = font.getlength(' ')
+    lines = []
+    current_line = []
+    current_width = 0
+    for word in text.split():
+        word_width = font.getlength(word)
+        candidate_width = current_width + space_width + word_width if current_line else word_width
+        if current_line and candidate_width > max_width:
+            lines.append(' '.join(current_line))
+            current_line = [word]
+            current_width = word_width
+        else:
+            current_line.append(word)
+            current_width = candidate_width
+    if current_line:
+        lines.append(' '.join(current_line))
+    return lines
+
+
+def render_placeholder(text, width=800, height=400, font_size=FONT_SIZE):
+    """ساخت تصویر جایگزین با پس‌زمینه‌ی گرادیانی و متن وسط‌چین"""
+    from PIL import ImageDraw
+
+    image = gradient_background(width, height).copy()
+    draw = ImageDraw.Draw(image)
+    font = get_font(font_size)
+
+    lines = wrap_text(text, font, width - TEXT_MARGIN)
+    line_height = font_size + LINE_SPACING
+    y = (height - len(lines) * line_height) // 2
+    for line in lines:
+        x = (width - font.getlength(line)) // 2
+        draw.text((x, y), line, font=font, fill=TEXT_COLOR)
+        y += line_height
+    return image
+
+
+def render_error_image(message, width=800, height=400):
+    """تصویر ساده‌ی خاکستری با پیام خطا"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    image = Image.new('RGB', (width, height), color='gray')
+    ImageDraw.Draw(image).text((10, height // 2), message, fill='white', font=ImageFont.load_default())
+    return image
@@ -0,0 +1,168 @@
+import re
+from collections import deque
+
+MAX_LINKS_PER_PAGE = 5
+MIN_PHRASE_LENGTH = 3
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_phrase(phrase):
+    return _WHITESPACE_RE.sub(" ", (phrase or "").lower()).strip()
+
+
+def _lower_same_length(text):
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        lowered = ''.join(ch.lower()[:1] for ch in text)
+    return lowered
+
+
+class LinkAutomaton:
+    """
+    خودکار Aho-Corasick روی همه‌ی عبارت‌های قابل لینک (عنوان محتواها و دسته‌بندی‌ها).
+    هر صفحه فقط یک بار پیمایش می‌شود. اضافه و حذف عبارت فقط trie را تغییر می‌دهد و
+    پیوندهای شکست در پیمایش بعدی یک بار دوباره ساخته می‌شوند.
+    """
+
+    def __init__(self, targets=None):
+        self._goto = [{}]
+        self._terminal = [None]
+        self._fail = None
+        self._outputs = None
+        self.targets = {}
+        if targets:
+            self.sync(targets)
+
+    def add(self, phrase, href):
+        key = normalize_phrase(phrase)
+        if len(key) < MIN_PHRASE_LENGTH:
+            return
+        if key in self.targets:
+            self.targets[key] = href
+            return
+        node = 0
+        for ch in key:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._terminal.append(None)
+            node = next_node
+        self._terminal[node] = key
+        self.targets[key] = href
+        self._fail = None
+
+    def remove(self, phrase):
+        key = normalize_phrase(phrase)
+        if self.targets.pop(key, None) is None:
+            return
+        node = 0
+        for ch in key:
+            node = self._goto[node][ch]
+        self._terminal[node] = None
+        self._fail = None
+
+    def sync(self, targets):
+        """هماهنگ کردن با {عبارت: href}؛ فقط عبارت‌های تغییر کرده اضافه یا حذف می‌شوند"""
+        wanted = {}
+        for phrase, href in targets.items():
+            key = normalize_phrase(phrase)
+            if len(key) >= MIN_PHRASE_LENGTH:
+                wanted[key] = href
+        for key in [key for key in self.targets if key not in wanted]:
+            self.remove(key)
+        for key, href in wanted.items():
+            if self.targets.get(key) != href:
+                self.add(key, href)
+
+    def _build(self):
+        fail = [0] * len(self._goto)
+        outputs = [()] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            terminal = self._terminal[node]
+            inherited = outputs[fail[node]]
+            outputs[node] = ((terminal,) + inherited) if terminal else inherited
+            for ch, child in self._goto[node].items():
+                state = fail[node]
+                while state and ch not in self._goto[state]:
+                    state = fail[state]
+                fail[child] = self._goto[state].get(ch, 0)
+                queue.append(child)
+        self._fail = fail
+        self._outputs = outputs
+
+    def find(self, text):
+        """همه‌ی رخدادهای کامل (با مرز کلمه) به صورت (شروع، پایان، عبارت)، چپ‌ترین و بلندترین بدون هم‌پوشانی"""
+        if not self.targets:
+            return []
+        if self._fail is None:
+            self._build()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        lowered = _lower_same_length(text)
+        length = len(text)
+        candidates = []
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for key in outputs[state]:
+                start = i - len(key) + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (i + 1 == length or not text[i + 1].isalnum()):
+                    candidates.append((start, -len(key), key))
+
+        matches = []
+        end = 0
+        for start, negative_length, key in sorted(candidates):
+            if start >= end:
+                end = start - negative_length
+                matches.append((start, end, key))
+        return matches
+
+    def linker(self, exclude=(), max_links=MAX_LINKS_PER_PAGE):
+        return PageLinker(self, exclude, max_links)
+
+
+class PageLinker:
+    """لینک‌دهی یک صفحه: هر مقصد حداکثر یک بار، حداکثر max_links لینک و بدون لینک به خود صفحه"""
+
+    def __init__(self, automaton, exclude=(), max_links=MAX_LINKS_PER_PAGE):
+        self.automaton = automaton
+        self.exclude = set(exclude)
+        self.max_links = max_links
+        self.linked = set()
+
+    def link(self, text):
+        parts = []
+        position = 0
+        for start, end, key in self.automaton.find(text):
+            if len(self.linked) >= self.max_links:
+                break
+            href = self.automaton.targets[key]
+            if href in self.linked or href in self.exclude:
+                continue
+            self.linked.add(href)
+            parts.append(text[position:start])
+            parts.append(f'<a href="{href}" class="internal-link">{text[start:end]}</a>')
+            position = end
+        if not parts:
+            return text
+        parts.append(text[position:])
+        return ''.join(parts)
+
+
+_automaton = None
+
+
+def get_automaton(targets):
+    """خودکار مشترک در این پردازه؛ با تغییر عنوان‌ها فقط به‌روز می‌شود و از نو ساخته نمی‌شود"""
+    global _automaton
+    if _automaton is None:
+        _automaton = LinkAutomaton(targets)
+    else:
+        _automaton.sync(targets)
+    return _automaton
@@ -0,0 +1,102 @@
+import hashlib
+import heapq
+import re
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import Dict, Hashable, List
+
+from seo_tools import persian
+from seo_tools.resources import load_nltk
+
+CACHE_SIZE = 4096
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+_keyword_cache = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def get_stop_words(language: str = 'en') -> frozenset:
+    """stopword ها فقط یک بار خوانده می‌شوند؛ متن فارسی stopword های فارسی و انگلیسی را با هم دارد"""
+    english = frozenset(load_nltk().corpus.stopwords.words('english'))
+    if language == 'fa':
+        return english | persian.STOP_WORDS
+    return english
+
+
+def tokenize(content: str, language: str = None) -> List[str]:
+    """توکن‌های کوچک شده؛ متن فارسی پیش از توکن‌سازی نرمال می‌شود و نیم‌فاصله داخل کلمه می‌ماند"""
+    if (language or persian.detect_language(content)) == 'fa':
+        return persian.tokenize(content)
+    return _WORD_RE.findall(content.lower())
+
+
+def _content_terms(content: str) -> List[str]:
+    language = persian.detect_language(content)
+    stop_words = get_stop_words(language)
+    return [word for word in tokenize(content, language) if word not in stop_words]
+
+
+def _content_key(content: str, num_keywords: int):
+    digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+    return digest, num_keywords
+
+
+def extract_keywords(content: str, num_keywords: int = 5) -> List[str]:
+    """پرتکرارترین کلمات غیر stopword؛ نتیجه بر اساس hash محتوا کش می‌شود"""
+    key = _content_key(content, num_keywords)
+    cached = _keyword_cache.get(key)
+    if cached is not None:
+        _keyword_cache.move_to_end(key)
+        return list(cached)
+
+    counts = Counter(_content_terms(content))
+    top = heapq.nlargest(num_keywords, counts.items(), key=lambda item: item[1])
+    keywords = tuple(word for word, _ in top)
+
+    _keyword_cache[key] = keywords
+    if len(_keyword_cache) > CACHE_SIZE:
+        _keyword_cache.popitem(last=False)
+    return list(keywords)
+
+
+def extract_corpus_keywords(documents: Dict[Hashable, str], num_keywords: int = 5) -> Dict[Hashable, List[str]]:
+    """
+    کلمات کلیدی TF-IDF برای کل مجموعه‌ی توضیحات در یک پاس برداری.
+    documents: {شناسه محتوا: متن} - خروجی: {شناسه محتوا: لیست کلمات کلیدی}
+    """
+    import numpy as np
+    from scipy import sparse
+
+    ids = list(documents)
+
+    vocabulary = {}
+    indptr, indices, data = [0], [], []
+    for content_id in ids:
+        counts = Counter(_content_terms(documents[content_id] or ''))
+        for word, count in counts.items():
+            indices.append(vocabulary.setdefault(word, len(vocabulary)))
+            data.append(count)
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(ids), len(vocabulary)),
+    )
+    df = np.bincount(matrix.indices, minlength=len(vocabulary))
+    idf = np.log((1 + len(ids)) / (1 + df)) + 1.0
+    matrix.data = (1.0 + np.log(matrix.data)) * idf[matrix.indices]
+
+    terms = np.asarray(list(vocabulary), dtype=object)
+    results = {}
+    for row, content_id in enumerate(ids):
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        scores = matrix.data[start:end]
+        columns = matrix.indices[start:end]
+        if len(scores) > num_keywords:
+            top = np.argpartition(-scores, num_keywords - 1)[:num_keywords]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        results[content_id] = terms[columns[top]].tolist()
+    return results
@@ -0,0 +1,61 @@
+import hashlib
+import json
+import os
+
+from seo_tools.templates import TEMPLATE_VERSION
+
+
+def content_input_hash(*values):
+    """hash ورودی‌هایی که خروجی صفحه به آن‌ها وابسته است"""
+    payload = json.dumps(values, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def output_hash(html_content):
+    return hashlib.sha256(html_content.encode('utf-8')).hexdigest()
+
+
+class BuildManifest:
+    """
+    فایل manifest ساخت صفحات: برای هر شناسه محتوا hash ورودی، نسخه‌ی قالب و hash خروجی.
+    فقط سطرهایی که تغییر کرده‌اند دوباره رندر و نوشته می‌شوند.
+    """
+
+    def __init__(self, path, template_version=TEMPLATE_VERSION):
+        self.path = path
+        self.template_version = template_version
+        self.entries = {}
+        self._dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('entries', {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def is_current(self, content_id, input_hash, output_path):
+        entry = self.entries.get(str(content_id))
+        return (
+            entry is not None
+            and entry['input_hash'] == input_hash
+            and entry['template_version'] == self.template_version
+            and os.path.exists(output_path)
+        )
+
+    def record(self, content_id, input_hash, html_hash):
+        self.entries[str(content_id)] = {
+            'input_hash': input_hash,
+            'template_version': self.template_version,
+            'output_hash': html_hash,
+        }
+        self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'entries': self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,57 @@
+import re
+
+ZWNJ = "\u200c"
+
+# حروف خط عربی/فارسی و حروف لاتین برای تشخیص زبان
+_ARABIC_SCRIPT_RE = re.compile("[\u0600-\u06ff\u0750-\u077f\ufb50-\ufdff\ufe70-\ufeff]")
+_LATIN_RE = re.compile(r"[A-Za-z]")
+LANGUAGE_SAMPLE_SIZE = 2000
+
+# کلمه می‌تواند با نیم‌فاصله (ZWNJ) به هم متصل باشد: «می‌شود» یک کلمه است
+WORD_RE = re.compile(r"[^\W_]+(?:\u200c[^\W_]+)*")
+
+_SPACED_ZWNJ_RE = re.compile(r"\s*\u200c+\s+|\s+\u200c+")
+_REPEATED_ZWNJ_RE = re.compile(r"\u200c{2,}")
+_DANGLING_ZWNJ_RE = re.compile(r"(?<![^\W_])\u200c|\u200c(?![^\W_])")
+
+# فقط ی و ک عربی جایگزین می‌شوند؛ همزه‌دارها (رئیس، مؤسسه) املای درست فارسی‌اند و دست نمی‌خورند
+_NORMALIZE_TABLE = str.maketrans({
+    "ي": "ی", "ى": "ی",
+    "ك": "ک",
+    "\u0640": None,  # کشیده
+    "\u200e": None, "\u200f": None, "\u200d": None,  # علامت‌های جهت و ZWJ
+    **{chr(code): None for code in range(0x064B, 0x0660)},  # اعراب
+    "\u0670": None,
+    **{digit: str(i) for i, digit in enumerate("۰۱۲۳۴۵۶۷۸۹")},
+    **{digit: str(i) for i, digit in enumerate("٠١٢٣٤٥٦٧٨٩")},
+})
+
+STOP_WORDS = frozenset("""
+و در به از که این را با است برای آن یک تا می‌شود شود شده شد بر هم نیز ای یا اما اگر
+هر خود دیگر ما من تو او شما آنها ایشان ها هایی کرد کرده کند کنند کنید کنیم کردن
+باشد باشند بود بودند بوده هست هستند نیست نیز همه همین همان چه چون چند چنین وی پس
+دارد دارند داشت داشته داریم بین روی زیر بالای پیش طور مانند بدون درباره توسط
+می‌کند می‌کنند می‌توان می‌تواند می‌باشد خواهد خواهند نمی‌شود ولی زیرا سپس حتی فقط
+آیا کدام کجا کی چرا چگونه اینکه آنکه بسیار خیلی بیشتر کمتر باید نباید شاید دو سه اول
+آن‌ها این‌ها اینها همه‌ی آن‌که این‌که می‌شوند می‌کنیم می‌کنید نمی‌کند نمی‌توان می‌توانند
+شده‌اند شده‌است کرده‌اند کرده‌است بوده‌اند بوده‌است به‌عنوان به‌ویژه بی‌آنکه چه‌طور هیچ‌گونه
+""".split())
+
+
+def detect_language(text, sample_size=LANGUAGE_SAMPLE_SIZE):
+    """'fa' اگر حروف خط فارسی/عربی در نمونه‌ی ابتدای متن از حروف لاتین بیشتر باشد، وگرنه 'en'"""
+    sample = (text or "")[:sample_size]
+    arabic_script = len(_ARABIC_SCRIPT_RE.findall(sample))
+    return "fa" if arabic_script and arabic_script >= len(_LATIN_RE.findall(sample)) else "en"
+
+
+def normalize(text):
+    """یکسان‌سازی ی/ک عربی و فارسی، حذف اعراب و کشیده، ارقام لاتین و مرتب کردن نیم‌فاصله‌ها"""
+    text = (text or "").translate(_NORMALIZE_TABLE)
+    text = _SPACED_ZWNJ_RE.sub(" ", text)
+    text = _REPEATED_ZWNJ_RE.sub(ZWNJ, text)
+    return _DANGLING_ZWNJ_RE.sub("", text)
+
+
+def tokenize(text):
+    return WORD_RE.findall(normalize(text).lower())
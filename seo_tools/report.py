@@ -0,0 +1,73 @@
+import datetime
+import json
+
+GRADES = ('A', 'B', 'C', 'D', 'F')
+
+
+class ReportSummary:
+    """آمار خلاصه (میانگین، کمینه، بیشینه و توزیع نمرات) که به صورت آنلاین به‌روز می‌شود"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_score = 0
+        self.highest_score = None
+        self.lowest_score = None
+        self.grade_distribution = {grade: 0 for grade in GRADES}
+
+    def add(self, score, grade):
+        self.count += 1
+        self.total_score += score
+        self.highest_score = score if self.highest_score is None else max(self.highest_score, score)
+        self.lowest_score = score if self.lowest_score is None else min(self.lowest_score, score)
+        self.grade_distribution[grade] = self.grade_distribution.get(grade, 0) + 1
+
+    @property
+    def average_score(self):
+        return self.total_score / self.count if self.count else 0
+
+    def as_dict(self):
+        return {
+            'processed_content': self.count,
+            'average_score': self.average_score,
+            'highest_score': self.highest_score,
+            'lowest_score': self.lowest_score,
+            'grade_distribution': dict(self.grade_distribution),
+        }
+
+
+class StreamingReportWriter:
+    """
+    گزارش JSONL: هر سطر محتوا بلافاصله بعد از پردازش به صورت یک خط JSON فشرده نوشته می‌شود
+    و رکورد خلاصه در پایان. در صورت crash، سطرهای نوشته شده از دست نمی‌روند.
+    """
+
+    def __init__(self, path, total_content):
+        self.path = path
+        self.summary = ReportSummary()
+        self._file = open(path, 'w', encoding='utf-8')
+        self._write_record({
+            'type': 'run',
+            'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'total_content': total_content,
+        })
+
+    def _write_record(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        self._file.write('\n')
+        self._file.flush()
+
+    def write(self, content_result):
+        self._write_record({'type': 'content', **content_result})
+        self.summary.add(content_result['seo_score'], content_result['grade'])
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._write_record({'type': 'summary', **self.summary.as_dict()})
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,47 @@
+import os
+
+NLTK_DATA_DIR = os.environ.get(
+    'SEO_NLTK_DATA',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nltk_data')
+)
+NLTK_PACKAGES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+}
+
+_nltk_ready = False
+
+
+def use_nltk_data_dir(path):
+    """تغییر پوشه‌ی داده‌های NLTK (پیش از اولین استفاده)"""
+    global NLTK_DATA_DIR
+    NLTK_DATA_DIR = path
+
+
+def load_nltk():
+    """nltk فقط در اولین استفاده import و داده‌هایش بررسی می‌شود"""
+    global _nltk_ready
+    import nltk
+
+    if not _nltk_ready:
+        if NLTK_DATA_DIR not in nltk.data.path:
+            nltk.data.path.insert(0, NLTK_DATA_DIR)
+        for package, resource in NLTK_PACKAGES.items():
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                nltk.download(package, download_dir=NLTK_DATA_DIR, quiet=True)
+        _nltk_ready = True
+    return nltk
+
+
+def prepare_nltk_data(target_dir=None):
+    """دانلود یک‌باره‌ی داده‌های NLTK در پوشه‌ی محلی تا اجراهای بعدی منتظر آن نمانند"""
+    import nltk
+
+    target_dir = target_dir or NLTK_DATA_DIR
+    os.makedirs(target_dir, exist_ok=True)
+    for package in NLTK_PACKAGES:
+        if not nltk.download(package, download_dir=target_dir, quiet=True):
+            raise RuntimeError(f"Failed to download NLTK package: {package}")
+    return target_dir
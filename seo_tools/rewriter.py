@@ -0,0 +1,121 @@
+import html
+import os
+import re
+
+# کلاس CSS که به هر تگ شروع اضافه می‌شود (فقط نام دقیق تگ؛ <p> با <pre> یا <param> یکی نیست)
+TAG_CLASSES = {
+    'h1': 'main-title',
+    'h2': 'section-heading',
+    'h3': 'subsection-heading',
+    'p': 'content-text',
+    'ul': 'content-list',
+    'li': 'list-item',
+}
+
+# تگ‌هایی که متن داخلشان لینک‌دار نمی‌شود
+NO_LINK_TAGS = frozenset({'a', 'script', 'style', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'code', 'pre'})
+
+TOKEN_RE = re.compile(r'<!--.*?-->|<[^>]*>', re.S)
+START_TAG_RE = re.compile(r'<([a-zA-Z][\w:-]*)(.*?)(/?)>$', re.S)
+END_TAG_RE = re.compile(r'</\s*([a-zA-Z][\w:-]*)\s*>$')
+CLASS_ATTR_RE = re.compile(r'(\sclass\s*=\s*)(?:(["\'])(.*?)\2|([^\s"\'>]+))', re.I | re.S)
+SRC_ATTR_RE = re.compile(r'\ssrc\s*=\s*(["\'])(.*?)\1', re.I | re.S)
+TITLE_ATTR_RE = re.compile(r'\stitle\s*=\s*(["\'])(.*?)\1', re.I | re.S)
+LOADING_ATTR_RE = re.compile(r'\sloading\s*=', re.I)
+ALT_ATTR_RE = re.compile(r'\salt\s*=', re.I)
+
+
+def topic_href(topic):
+    return html.escape(f"/topic/{topic.lower().replace(' ', '-')}", quote=True)
+
+
+class TopicLinker:
+    """لینک کردن اولین رخداد هر موضوع در گره‌های متنی، حداکثر max_links لینک در هر صفحه"""
+
+    def __init__(self, topics, max_links=None):
+        self.topics = {topic: topic_href(topic) for topic in topics if topic}
+        self.max_links = max_links
+        self.linked = set()
+        pattern = '|'.join(re.escape(topic) for topic in sorted(self.topics, key=len, reverse=True))
+        self._pattern = re.compile(pattern) if pattern else None
+
+    def link(self, text):
+        if self._pattern is None:
+            return text
+
+        def replace(match):
+            topic = match.group(0)
+            if topic in self.linked or (self.max_links is not None and len(self.linked) >= self.max_links):
+                return topic
+            self.linked.add(topic)
+            return f'<a href="{self.topics[topic]}" class="internal-link">{topic}</a>'
+
+        return self._pattern.sub(replace, text)
+
+
+def _image_alt(attrs):
+    title = TITLE_ATTR_RE.search(attrs)
+    if title:
+        return title.group(2)
+    src = SRC_ATTR_RE.search(attrs)
+    if src:
+        name = os.path.splitext(os.path.basename(src.group(2).split('?')[0]))[0]
+        return html.escape(re.sub(r'[-_]+', ' ', name).strip(), quote=True)
+    return ''
+
+
+def _rewrite_start_tag(name, attrs, self_closing, tag_classes, optimize_images):
+    css_class = tag_classes.get(name)
+    if css_class:
+        existing = CLASS_ATTR_RE.search(attrs)
+        if existing:
+            quote = existing.group(2) or '"'
+            classes = (existing.group(3) if existing.group(2) else existing.group(4)).split()
+            if css_class not in classes:
+                value = ' '.join([css_class] + classes)
+                attrs = (attrs[:existing.start()] + f'{existing.group(1)}{quote}{value}{quote}' + attrs[existing.end():])
+        else:
+            attrs = f' class="{css_class}"' + attrs
+    elif name == 'img' and optimize_images:
+        if not LOADING_ATTR_RE.search(attrs):
+            attrs += ' loading="lazy"'
+        if not ALT_ATTR_RE.search(attrs):
+            attrs += f' alt="{_image_alt(attrs)}"'
+    return f"<{name}{attrs}{self_closing}>"
+
+
+def rewrite_html(content, linker=None, tag_classes=TAG_CLASSES, optimize_images=True):
+    """
+    یک گذر روی HTML: اضافه کردن کلاس‌ها، loading="lazy" و alt تصاویر، و لینک‌های داخلی در گره‌های متنی.
+    خروجی با یک ''.join ساخته می‌شود.
+    """
+    parts = []
+    no_link_depth = 0
+    position = 0
+    for match in TOKEN_RE.finditer(content):
+        text = content[position:match.start()]
+        if text:
+            parts.append(linker.link(text) if linker and not no_link_depth else text)
+        position = match.end()
+
+        tag = match.group(0)
+        start = START_TAG_RE.match(tag)
+        if start:
+            name, attrs, self_closing = start.groups()
+            name = name.lower()
+            if self_closing and attrs.endswith(' '):
+                attrs, self_closing = attrs.rstrip(), ' /'
+            parts.append(_rewrite_start_tag(name, attrs, self_closing, tag_classes, optimize_images))
+            if name in NO_LINK_TAGS and not self_closing:
+                no_link_depth += 1
+            continue
+
+        end = END_TAG_RE.match(tag)
+        if end and end.group(1).lower() in NO_LINK_TAGS and no_link_depth:
+            no_link_depth -= 1
+        parts.append(tag)
+
+    text = content[position:]
+    if text:
+        parts.append(linker.link(text) if linker and not no_link_depth else text)
+    return ''.join(parts)
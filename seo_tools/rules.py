@@ -0,0 +1,127 @@
+import operator
+from collections import namedtuple
+from functools import lru_cache
+
+# Bump whenever a rule, weight or message changes so cached scores are recomputed
+RULESET_VERSION = 1
+
+SEVERITIES = ('critical', 'important', 'moderate', 'minor')
+
+FEATURES = (
+    'title_length',
+    'word_count',
+    'internal_links',
+    'external_links',
+    'has_meta_viewport',
+    'has_schema_markup',
+    'has_canonical',
+)
+
+Rule = namedtuple('Rule', ['id', 'severity', 'weight', 'message', 'conditions', 'suggestion'])
+Suggestion = namedtuple('Suggestion', ['priority', 'text'])
+
+SUGGESTIONS = {
+    'meta_title_length': Suggestion(1, "طول عنوان متا را بین 30 تا 60 کاراکتر تنظیم کنید"),
+    'content_length': Suggestion(1, "محتوا را به حداقل 300 کلمه افزایش دهید"),
+    'internal_links': Suggestion(2, "لینک‌های داخلی به محتوای مرتبط اضافه کنید"),
+    'viewport': Suggestion(1, "تگ viewport برای سازگاری با موبایل اضافه کنید"),
+    'schema_markup': Suggestion(3, "Schema Markup مناسب برای محتوا اضافه کنید"),
+}
+
+# هر قانون: شرط‌ها (feature, عملگر, مقدار) که با AND ترکیب می‌شوند
+RULES = (
+    # بررسی عنوان (25 امتیاز)
+    Rule('meta_title_missing', 'critical', 25, "عنوان متا وجود ندارد",
+         (('title_length', '==', 0),), 'meta_title_length'),
+    Rule('meta_title_too_long', 'important', 15, "عنوان متا خیلی طولانی است (بیش از 60 کاراکتر)",
+         (('title_length', '>', 60),), 'meta_title_length'),
+    Rule('meta_title_too_short', 'moderate', 10, "عنوان متا خیلی کوتاه است (کمتر از 30 کاراکتر)",
+         (('title_length', '>', 0), ('title_length', '<', 30)), 'meta_title_length'),
+    # بررسی محتوا (35 امتیاز)
+    Rule('content_too_short', 'critical', 25, "محتوا خیلی کوتاه است (کمتر از 300 کلمه)",
+         (('word_count', '<', 300),), 'content_length'),
+    Rule('content_could_be_longer', 'important', 10, "محتوا می‌تواند طولانی‌تر باشد (کمتر از 500 کلمه)",
+         (('word_count', '>=', 300), ('word_count', '<', 500)), None),
+    # بررسی ساختار (25 امتیاز)
+    Rule('no_internal_links', 'important', 8, "لینک داخلی وجود ندارد",
+         (('internal_links', '==', 0),), 'internal_links'),
+    Rule('no_external_links', 'moderate', 7, "لینک خارجی وجود ندارد",
+         (('external_links', '==', 0),), None),
+    # بررسی فنی (15 امتیاز)
+    Rule('no_meta_viewport', 'important', 8, "تگ viewport برای موبایل وجود ندارد",
+         (('has_meta_viewport', '==', 0),), 'viewport'),
+    Rule('no_schema_markup', 'moderate', 4, "Schema Markup وجود ندارد",
+         (('has_schema_markup', '==', 0),), 'schema_markup'),
+    Rule('no_canonical', 'minor', 3, "لینک canonical وجود ندارد",
+         (('has_canonical', '==', 0),), None),
+)
+
+OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+class CompiledRuleSet:
+    """
+    مجموعه قوانین کامپایل شده: شرط‌ها یک بار به عملگرهای برداری تبدیل می‌شوند و
+    روی ستون‌های feature (آرایه‌های NumPy) برای یک دسته از سطرها یکجا ارزیابی می‌شوند.
+    """
+
+    def __init__(self, rules=RULES):
+        import numpy as np
+
+        self.rules = rules
+        self.weights = np.asarray([rule.weight for rule in rules], dtype=np.int64)
+        self.conditions = [
+            (index, feature, OPERATORS[op], value)
+            for index, rule in enumerate(rules)
+            for feature, op, value in rule.conditions
+        ]
+        # ترتیب گزارش: اول شدت، بعد ترتیب تعریف قانون
+        self.report_order = sorted(range(len(rules)), key=lambda i: (SEVERITIES.index(rules[i].severity), i))
+
+    def evaluate(self, columns):
+        """columns: {نام feature: آرایه}؛ خروجی: (امتیازها، ماتریس قوانین فعال شده)"""
+        import numpy as np
+
+        size = len(next(iter(columns.values()))) if columns else 0
+        fired = np.ones((size, len(self.rules)), dtype=bool)
+        for index, feature, op, value in self.conditions:
+            fired[:, index] &= op(columns[feature], value)
+        scores = np.clip(100 - fired.astype(np.int64) @ self.weights, 0, 100)
+        return scores, fired
+
+    def explain(self, fired_row):
+        """مشکلات (بر اساس شدت) و پیشنهادها برای یک سطر"""
+        issues = {severity: [] for severity in SEVERITIES}
+        suggestions = []
+        for index in self.report_order:
+            if not fired_row[index]:
+                continue
+            rule = self.rules[index]
+            issues[rule.severity].append(rule.message)
+            if rule.suggestion:
+                suggestion = SUGGESTIONS[rule.suggestion]
+                suggestions.append({'priority': suggestion.priority, 'text': suggestion.text})
+        suggestions.sort(key=lambda item: item['priority'])
+        return issues, suggestions
+
+
+def to_columns(feature_rows):
+    """تبدیل لیست دیکشنری‌های feature به آرایه‌های ستونی"""
+    import numpy as np
+
+    return {
+        feature: np.fromiter((row[feature] for row in feature_rows), dtype=np.int64, count=len(feature_rows))
+        for feature in FEATURES
+    }
+
+
+@lru_cache(maxsize=1)
+def get_ruleset():
+    return CompiledRuleSet(RULES)
@@ -0,0 +1,96 @@
+import datetime
+import json
+import os
+import sqlite3
+
+from seo_tools.report import GRADES
+
+
+class ScoreStore:
+    """
+    مخزن ماندگار امتیازهای SEO (SQLite) با کلید (شناسه محتوا، hash ورودی، نسخه‌ی قوانین).
+    سطرهایی که ورودی‌شان تغییر نکرده دوباره امتیازدهی نمی‌شوند.
+    """
+
+    def __init__(self, path, ruleset_version):
+        self.path = path
+        self.ruleset_version = ruleset_version
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS scores (
+                content_id TEXT PRIMARY KEY,
+                input_hash TEXT NOT NULL,
+                ruleset_version INTEGER NOT NULL,
+                score INTEGER NOT NULL,
+                grade TEXT NOT NULL,
+                issues TEXT NOT NULL,
+                suggestions TEXT NOT NULL,
+                seo_metadata TEXT NOT NULL,
+                updated_at TEXT
+            )
+        """)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def load(self):
+        """همه‌ی امتیازهای نسخه‌ی فعلی قوانین: {شناسه محتوا: (hash ورودی، نتیجه)}"""
+        rows = self.connection.execute(
+            "SELECT content_id, input_hash, score, grade, issues, suggestions, seo_metadata "
+            "FROM scores WHERE ruleset_version = ?",
+            (self.ruleset_version,)
+        )
+        return {
+            content_id: (input_hash, {
+                'score': score,
+                'grade': grade,
+                'issues': json.loads(issues),
+                'suggestions': json.loads(suggestions),
+                'seo_metadata': json.loads(seo_metadata),
+            })
+            for content_id, input_hash, score, grade, issues, suggestions, seo_metadata in rows
+        }
+
+    def put_many(self, entries):
+        """entries: لیست (شناسه محتوا، hash ورودی، content_result)"""
+        now = datetime.datetime.now().isoformat()
+        self.connection.executemany("""
+            INSERT OR REPLACE INTO scores
+                (content_id, input_hash, ruleset_version, score, grade, issues, suggestions, seo_metadata, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                str(content_id), input_hash, self.ruleset_version,
+                result['seo_score'], result['grade'],
+                json.dumps(result['issues'], ensure_ascii=False),
+                json.dumps(result['suggestions'], ensure_ascii=False),
+                # The enhanced page is only needed while scoring and is not worth persisting
+                json.dumps({k: v for k, v in result['seo_metadata'].items() if k != 'enhanced_content'},
+                           ensure_ascii=False),
+                now,
+            )
+            for content_id, input_hash, result in entries
+        ])
+        self.connection.commit()
+
+    def summary(self):
+        """آمار خلاصه مستقیم از مخزن، بدون امتیازدهی دوباره"""
+        count, average, highest, lowest = self.connection.execute(
+            "SELECT COUNT(*), AVG(score), MAX(score), MIN(score) FROM scores WHERE ruleset_version = ?",
+            (self.ruleset_version,)
+        ).fetchone()
+        grade_distribution = {grade: 0 for grade in GRADES}
+        for grade, grade_count in self.connection.execute(
+            "SELECT grade, COUNT(*) FROM scores WHERE ruleset_version = ? GROUP BY grade",
+            (self.ruleset_version,)
+        ):
+            grade_distribution[grade] = grade_count
+        return {
+            'processed_content': count,
+            'average_score': average or 0,
+            'highest_score': highest,
+            'lowest_score': lowest,
+            'grade_distribution': grade_distribution,
+        }
@@ -0,0 +1,144 @@
+import hashlib
+import re
+import zlib
+
+from seo_tools.formatting import split_sentences
+from seo_tools.keywords import tokenize
+
+# جمله‌هایی که شباهت Jaccard مجموعه‌ی کلماتشان حداقل این مقدار است تقریباً تکراری هستند
+# (یک کلمه تغییر در جمله‌ی 15 کلمه‌ای: 0.875، «website» به جای «site» در جمله‌ی 10 کلمه‌ای: 0.82)
+NEAR_DUPLICATE_JACCARD = 0.7
+# جمله‌های کوتاه‌تر فقط با hash دقیق مقایسه می‌شوند
+MIN_NEAR_DUPLICATE_TOKENS = 4
+# امضای MinHash جمله: 16 باند 2 سطری، تا جفت‌های با شباهت 0.7 تقریباً همیشه نامزد شوند
+MINHASH_BANDS = 16
+MINHASH_ROWS = 2
+MINHASH_SEED = 7
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_BLOCK_TAGS = (r'p|div|h[1-6]|li|ul|ol|blockquote|section|article|header|footer|nav|main|aside|'
+               r'table|tr|td|th|pre|br|hr|html|body')
+# بخش‌های بدون متن خواندنی، تگ‌های بلوکی و خط جدید؛ متن بین آن‌ها یک بلوک است
+# (تگ‌های درون خطی مثل <a> داخل جمله می‌مانند)
+_SEGMENT_RE = re.compile(
+    r'<(script|style|head|title)\b[^>]*>.*?</\1\s*>|<\s*/?\s*(?:' + _BLOCK_TAGS + r')\b[^>]*>|\n',
+    re.I | re.S
+)
+# عنصرهایی که بعد از حذف جمله‌های تکراری خالی مانده‌اند
+_EMPTY_ELEMENT_RE = re.compile(r'<(p|li|h[1-6]|blockquote|div|td|th|ul|ol)\b[^>]*>\s*</\1\s*>\n?', re.I)
+
+
+def sentence_tokens(sentence):
+    """کلمات نرمال شده‌ی جمله (بدون تگ‌های HTML)"""
+    return tokenize(_TAG_RE.sub(' ', sentence))
+
+
+def exact_key(tokens):
+    return hashlib.blake2b(' '.join(tokens).encode('utf-8'), digest_size=8).digest()
+
+
+def _minhash_parameters():
+    import numpy as np
+
+    rng = np.random.default_rng(MINHASH_SEED)
+    size = MINHASH_BANDS * MINHASH_ROWS
+    a = rng.integers(1, 2 ** 63, size=size, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=size, dtype=np.uint64)
+    return a, b
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class SentenceDeduplicator:
+    """
+    حذف جمله‌های تکراری (hash دقیق) و تقریباً تکراری (شباهت Jaccard کلمات).
+    نامزدها با باندهای MinHash پیدا و سپس با Jaccard دقیق تأیید می‌شوند.
+    """
+
+    def __init__(self, threshold=NEAR_DUPLICATE_JACCARD):
+        self.threshold = threshold
+        self.exact = set()
+        self.token_sets = []
+        self.buckets = [{} for _ in range(MINHASH_BANDS)]
+        self._a, self._b = _minhash_parameters()
+
+    def _band_keys(self, tokens):
+        import numpy as np
+
+        hashes = np.fromiter((zlib.crc32(token.encode('utf-8')) for token in tokens),
+                             dtype=np.uint64, count=len(tokens))
+        signature = ((hashes[:, None] * self._a + self._b) >> np.uint64(32)).min(axis=0)
+        return [rows.tobytes() for rows in signature.reshape(MINHASH_BANDS, MINHASH_ROWS)]
+
+    def add(self, sentence):
+        """ثبت جمله؛ اگر تکراری یا تقریباً تکراری باشد False برمی‌گرداند"""
+        tokens = sentence_tokens(sentence)
+        if not tokens:
+            return False
+        key = exact_key(tokens)
+        if key in self.exact:
+            return False
+        self.exact.add(key)
+
+        token_set = frozenset(tokens)
+        if len(token_set) < MIN_NEAR_DUPLICATE_TOKENS:
+            return True
+        band_keys = self._band_keys(sorted(token_set))
+        candidates = {index for buckets, band_key in zip(self.buckets, band_keys)
+                      for index in buckets.get(band_key, ())}
+        if any(jaccard(token_set, self.token_sets[index]) >= self.threshold for index in candidates):
+            return False
+        index = len(self.token_sets)
+        self.token_sets.append(token_set)
+        for buckets, band_key in zip(self.buckets, band_keys):
+            buckets.setdefault(band_key, []).append(index)
+        return True
+
+
+def _segments(content):
+    """(متن بلوک، جداکننده‌ی بعدی) برای همه‌ی بلوک‌های متن یا HTML"""
+    position = 0
+    for match in _SEGMENT_RE.finditer(content):
+        yield content[position:match.start()], match.group(0)
+        position = match.end()
+    yield content[position:], ''
+
+
+def content_sentences(content):
+    """جمله‌های متن یا HTML؛ ابتدا روی مرز بلوک‌ها و خطوط و سپس روی علامت پایان جمله تقسیم می‌شود"""
+    sentences = []
+    for block, _ in _segments(content):
+        if block.strip():
+            sentences.extend(split_sentences(block))
+    return sentences
+
+
+def merge_blocks(current_content, new_content):
+    """
+    new_content بلوک به بلوک با حفظ markup (عنوان‌ها، لیست‌ها، نقل قول‌ها)؛ فقط جمله‌هایی حذف می‌شوند
+    که در current_content یا قبل‌تر در خود new_content (تقریباً) تکرار شده‌اند و عنصرهای خالی مانده حذف می‌شوند.
+    خروجی: (HTML بلوک‌های باقی‌مانده، تعداد کلمات متن ترکیبی)
+    """
+    deduplicator = SentenceDeduplicator()
+    for sentence in content_sentences(current_content):
+        deduplicator.add(sentence)
+
+    word_count = len(current_content.split())
+    parts = []
+    for block, separator in _segments(new_content):
+        if block.strip():
+            sentences = split_sentences(block)
+            kept = [sentence for sentence in sentences if deduplicator.add(sentence)]
+            word_count += sum(len(sentence.split()) for sentence in kept)
+            if len(kept) != len(sentences):
+                block = ' '.join(kept)
+        parts.append(block)
+        parts.append(separator)
+
+    merged = ''.join(parts)
+    # یک بار برای عنصرهای خالی و یک بار برای لیست‌هایی که همه‌ی آیتم‌هایشان حذف شده
+    for _ in range(2):
+        merged = _EMPTY_ELEMENT_RE.sub('', merged)
+    return merged, word_count
@@ -0,0 +1,236 @@
+import string
+from functools import lru_cache
+
+# Bump whenever a page template changes so previously generated pages are rebuilt
+TEMPLATE_VERSION = 4
+
+RESOURCE_LINK_SEPARATOR = "\n                            "
+
+
+class Template:
+    """
+    قالب صفحه که فقط یک بار به قطعه‌های ثابت و جایگاه‌ها (slot) کامپایل می‌شود.
+    render فقط جایگاه‌ها را پر می‌کند و خروجی را با یک ''.join می‌سازد.
+    """
+
+    def __init__(self, source):
+        self.parts = []
+        self.slots = []
+        for literal, field, _, _ in string.Formatter().parse(source):
+            if literal:
+                self.parts.append(literal)
+            if field is not None:
+                self.slots.append((len(self.parts), field))
+                self.parts.append(None)
+
+    def render(self, **values):
+        parts = self.parts[:]
+        for position, name in self.slots:
+            parts[position] = str(values[name])
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=4096)
+def slugify(text):
+    return text.lower().replace(' ', '-')
+
+
+ARTICLE_PAGE = Template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=5.0">
+    <meta name="robots" content="index, follow">
+    <link rel="canonical" href="https://yourdomain.com/content/{id}">
+    <title>{title}</title>
+    <meta name="description" content="{description}">
+    <meta name="keywords" content="{keywords}">
+    
+    <!-- Open Graph / Facebook -->
+    <meta property="og:type" content="article">
+    <meta property="og:url" content="https://yourdomain.com/content/{id}">
+    <meta property="og:title" content="{title}">
+    <meta property="og:description" content="{description}">
+    
+    <!-- Twitter -->
+    <meta property="twitter:card" content="summary">
+    <meta property="twitter:url" content="https://yourdomain.com/content/{id}">
+    <meta property="twitter:title" content="{title}">
+    <meta property="twitter:description" content="{description}">
+    
+    <!-- Custom CSS -->
+    {styles}
+</head>
+<body>
+    <article itemscope itemtype="https://schema.org/Article">
+        <meta itemprop="headline" content="{title}">
+        <meta itemprop="description" content="{description}">
+        <meta itemprop="author" content="{author}">
+        <meta itemprop="datePublished" content="{date_published}">
+        
+        <h1 itemprop="name">{title}</h1>
+        {hero}
+        <nav class="table-of-contents">
+            <h2>Table of Contents</h2>
+            <ul>
+                <li><a href="#introduction">Introduction</a></li>
+                {toc}
+            </ul>
+        </nav>
+        
+        <div itemprop="articleBody">
+            <section id="introduction" class="content-section">
+                <h2>Introduction</h2>
+                <p>{introduction}</p>
+            </section>{sections}
+        </div>
+    </article>
+</body>
+</html>''')
+
+ARTICLE_SECTION = Template('''
+            <section id="{id}" class="content-section">
+                <h2>{title}</h2>
+                <p>{content}</p>
+            </section>''')
+
+ARTICLE_TOC_ITEM = Template('<li><a href="#{id}">{title}</a></li>')
+
+ENHANCED_PAGE = Template("""
+        <!DOCTYPE html>
+        <html lang="en">
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=5.0">
+            <meta name="robots" content="index, follow">
+            <link rel="canonical" href="https://yourdomain.com/content/{id}">
+            <title>{meta_title}</title>
+            <meta name="description" content="{description}">
+            <meta name="keywords" content="{keywords}">
+            
+            <!-- Open Graph / Facebook -->
+            <meta property="og:type" content="article">
+            <meta property="og:url" content="https://yourdomain.com/content/{id}">
+            <meta property="og:title" content="{meta_title}">
+            <meta property="og:description" content="{description}">
+            
+            <!-- Twitter -->
+            <meta property="twitter:card" content="summary">
+            <meta property="twitter:url" content="https://yourdomain.com/content/{id}">
+            <meta property="twitter:title" content="{meta_title}">
+            <meta property="twitter:description" content="{description}">
+            
+            <!-- Custom CSS -->
+            {styles}
+        </head>
+        <body>
+            <article itemscope itemtype="https://schema.org/Article">
+                <meta itemprop="headline" content="{meta_title}">
+                <meta itemprop="description" content="{description}">
+                <meta itemprop="author" content="{author}">
+                <meta itemprop="datePublished" content="{date_published}">
+                
+                <h1 itemprop="name">{title}</h1>
+                
+                <nav class="table-of-contents">
+                    <h2>Table of Contents</h2>
+                    <ul>
+                        {toc}
+                    </ul>
+                </nav>
+                
+                <div itemprop="articleBody">
+                    <section id="introduction-to-{title_slug}">
+                        <h2>Introduction to {title}</h2>
+                        <p>{body_description}</p>
+                        <p>Welcome to our comprehensive guide on {title}. This article will help you understand the key concepts and practical applications.</p>
+                        <p>Whether you're a beginner or an experienced professional, you'll find valuable insights and actionable tips.</p>
+                    </section>
+                    
+                    <section id="key-features-and-benefits">
+                        <h2>Key Features and Benefits</h2>
+                        <p>Here are the main features and benefits of {title}:</p>
+                        <ul>
+                            <li>Comprehensive overview and understanding</li>
+                            <li>Practical applications and real-world use cases</li>
+                            <li>Industry best practices and standards</li>
+                            <li>Easy integration with existing systems</li>
+                            <li>Future trends and developments</li>
+                        </ul>
+                    </section>
+                    
+                    <section id="how-to-get-started">
+                        <h2>How to Get Started</h2>
+                        <p>Getting started with {title} is easy. Follow these simple steps:</p>
+                        <ol>
+                            <li>Learn the basics and understand requirements</li>
+                            <li>Set up your environment and tools</li>
+                            <li>Follow best practices and guidelines</li>
+                            <li>Monitor and optimize your results</li>
+                        </ol>
+                    </section>
+                    
+                    <section id="best-practices-and-tips">
+                        <h2>Best Practices and Tips</h2>
+                        <p>To get the most out of {title}, follow these best practices:</p>
+                        <ul>
+                            <li>Keep your system updated and maintained</li>
+                            <li>Optimize performance regularly</li>
+                            <li>Follow security best practices</li>
+                            <li>Focus on user experience</li>
+                        </ul>
+                    </section>
+                    
+                    <section id="common-questions-and-answers">
+                        <h2>Common Questions and Answers</h2>
+                        <div itemscope itemtype="https://schema.org/FAQPage">
+                            <div itemscope itemprop="mainEntity" itemtype="https://schema.org/Question">
+                                <h3 itemprop="name">What are the main benefits of {title}?</h3>
+                                <div itemscope itemprop="acceptedAnswer" itemtype="https://schema.org/Answer">
+                                    <div itemprop="text">
+                                        <p>{title} offers many benefits. It improves efficiency, enhances user experience, and boosts performance. Learn more in our detailed guide.</p>
+                                    </div>
+                                </div>
+                            </div>
+                        </div>
+                    </section>
+                    
+                    <section id="case-studies-and-examples">
+                        <h2>Case Studies and Examples</h2>
+                        <p>Here are some real-world examples of {title} in action:</p>
+                        <ul>
+                            <li>Success story: How Company X improved results</li>
+                            <li>Implementation: Overcoming challenges</li>
+                            <li>Results: Measurable improvements</li>
+                        </ul>
+                    </section>
+                    
+                    <section id="additional-resources">
+                        <h2>Additional Resources</h2>
+                        <p>Want to learn more about {title}? Check out these resources:</p>
+                        <ul>
+                            {resource_links}
+                        </ul>
+                    </section>
+                    
+                    <section id="conclusion">
+                        <h2>Conclusion</h2>
+                        <p>{title} is a powerful tool for modern professionals. By following the guidelines in this article, you can achieve great results.</p>
+                        <p>Start implementing these best practices today to see the benefits.</p>
+                    </section>
+                </div>
+            </article>
+        </body>
+        </html>
+""")
+
+ENHANCED_TOC_ITEM = Template("<li><a href='#{id}'>{title}</a></li>")
+
+RESOURCE_LINK = Template('<li><a href="{url}" rel="{rel}">{text}</a></li>')
+
+PICTURE = Template(
+    '<picture>{sources}<img src="{src}" srcset="{srcset}" sizes="{sizes}" '
+    'width="{width}" height="{height}" alt="{alt}" loading="lazy" decoding="async"></picture>'
+)
+
+PICTURE_SOURCE = Template('<source type="{type}" srcset="{srcset}" sizes="{sizes}">')
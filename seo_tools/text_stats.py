@@ -0,0 +1,78 @@
+import re
+from collections import Counter, namedtuple
+
+from seo_tools import persian
+from seo_tools.resources import load_nltk
+
+# واحدهای متن در یک گذر: کلمه یا یک دنباله از علامت‌های پایان جمله
+_TOKEN_RE = re.compile(r"(?P<word>[^\W_]+(?:\u200c[^\W_]+)*)|(?P<end>[.!?؟]+)")
+_WORD_RE = re.compile(r"[^\W_]+(?:\u200c[^\W_]+)*")
+_VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+
+
+def count_syllables(word):
+    """تخمین تعداد هجا با گروه‌های حروف صدادار (کلمات غیر لاتین یک هجا حساب می‌شوند)"""
+    return len(_VOWEL_GROUP_RE.findall(word)) or 1
+
+
+class TextStats(namedtuple('TextStats', ['word_count', 'sentence_count', 'unique_word_count', 'syllable_count'])):
+    """آمار متن قابل مشاهده؛ همه‌ی نسبت‌ها برای متن خالی صفر هستند"""
+
+    __slots__ = ()
+
+    @property
+    def average_sentence_length(self):
+        return self.word_count / self.sentence_count if self.sentence_count else 0.0
+
+    @property
+    def lexical_diversity(self):
+        return self.unique_word_count / self.word_count if self.word_count else 0.0
+
+    @property
+    def flesch_reading_ease(self):
+        if not self.word_count:
+            return 0.0
+        return (206.835
+                - 1.015 * self.average_sentence_length
+                - 84.6 * (self.syllable_count / self.word_count))
+
+
+def _fast_stats(text):
+    word_counts = Counter()
+    sentence_count = 0
+    open_sentence = False
+    if persian.detect_language(text) == 'fa':
+        text = persian.normalize(text)
+    for word, _ in _TOKEN_RE.findall(text.lower()):
+        if word:
+            word_counts[word] += 1
+            open_sentence = True
+        elif open_sentence:
+            sentence_count += 1
+            open_sentence = False
+    if open_sentence:
+        sentence_count += 1
+    # هجاها برای هر کلمه‌ی یکتا فقط یک بار شمرده می‌شوند
+    syllable_count = sum(count * count_syllables(word) for word, count in word_counts.items())
+    return TextStats(sum(word_counts.values()), sentence_count, len(word_counts), syllable_count)
+
+
+def _nltk_stats(text):
+    nltk = load_nltk()
+    sentences = nltk.sent_tokenize(text)
+    words = [word.lower() for word in nltk.word_tokenize(text) if _WORD_RE.fullmatch(word)]
+    return TextStats(
+        len(words),
+        sum(1 for sentence in sentences if _WORD_RE.search(sentence)),
+        len(set(words)),
+        sum(count_syllables(word) for word in words),
+    )
+
+
+def compute_text_stats(text, accurate=False):
+    """
+    تعداد کلمات و جمله‌ها، میانگین طول جمله، تنوع واژگانی و خوانایی Flesch در یک گذر با regex.
+    با accurate=True از توکنایزرهای NLTK (Punkt) استفاده می‌شود که دقیق‌تر ولی کندتر است.
+    """
+    text = text or ""
+    return _nltk_stats(text) if accurate else _fast_stats(text)
@@ -0,0 +1,49 @@
+from content_manager.category_cache import CategoryCache
+
+
+class FakeCategoryDatabase:
+    """جدول دسته‌بندی در حافظه با همان probe نسخه‌ی content_database"""
+
+    def __init__(self, rows):
+        self.rows = dict(rows)
+        self.full_loads = 0
+
+    def get_category_version(self, known_max_id=0):
+        def checksum(ids):
+            value = 0
+            for cid in ids:
+                value ^= hash((cid, self.rows[cid])) & 0x7FFFFFFF
+            return value
+
+        return (max(self.rows, default=0), len(self.rows),
+                checksum(self.rows), checksum(cid for cid in self.rows if cid <= known_max_id))
+
+    def get_category(self):
+        self.full_loads += 1
+        return list(self.rows.items())
+
+    def get_categories_since(self, last_id):
+        return [(cid, title) for cid, title in self.rows.items() if cid > last_id]
+
+
+def test_rename_triggers_full_reload(tmp_path):
+    db = FakeCategoryDatabase({1: "Tech", 2: "Health"})
+    cache = CategoryCache(str(tmp_path / "categories.json"), ttl=0)
+    assert cache.load(db) == {"Tech": 1, "Health": 2}
+
+    db.rows[2] = "Wellness"
+    assert cache.load(db) == {"Tech": 1, "Wellness": 2}
+    assert db.full_loads == 2
+
+
+def test_new_rows_load_incrementally(tmp_path):
+    db = FakeCategoryDatabase({1: "Tech"})
+    cache = CategoryCache(str(tmp_path / "categories.json"), ttl=0)
+    cache.load(db)
+
+    db.rows[2] = "Health"
+    cache.add("Health", 2)
+    db.rows[3] = "Travel"
+    assert cache.load(db) == {"Tech": 1, "Health": 2, "Travel": 3}
+    assert cache.load(db) == {"Tech": 1, "Health": 2, "Travel": 3}
+    assert db.full_loads == 1
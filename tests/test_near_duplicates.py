@@ -0,0 +1,11 @@
+from content_manager.near_duplicates import MinHashLSHIndex
+
+TEXT = "alpha beta gamma delta epsilon zeta eta theta iota kappa"
+
+
+def test_empty_descriptions_are_signed_once():
+    index = MinHashLSHIndex(":memory:")
+    rows = [(1, None), (2, ""), (3, TEXT), (4, TEXT)]
+    assert index.update(rows) == 4
+    assert index.update(rows) == 0
+    assert index.clusters() == [[3, 4]]
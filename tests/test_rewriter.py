@@ -0,0 +1,26 @@
+from seo_tools.rewriter import rewrite_html
+
+
+def test_adds_class_to_bare_tag():
+    assert rewrite_html("<p>text</p>") == '<p class="content-text">text</p>'
+
+
+def test_merges_quoted_class():
+    assert rewrite_html('<p class="lead">a</p>') == '<p class="content-text lead">a</p>'
+    assert rewrite_html("<p class='lead intro'>a</p>") == "<p class='content-text lead intro'>a</p>"
+
+
+def test_merges_unquoted_class_without_duplicating_attribute():
+    result = rewrite_html('<p class=foo id=x>a</p>')
+    assert result == '<p class="content-text foo" id=x>a</p>'
+    assert result.count("class=") == 1
+
+
+def test_unquoted_class_on_self_closing_tag():
+    result = rewrite_html('<li class=item/>', tag_classes={'li': 'list-item'})
+    assert result == '<li class="list-item item"/>'
+
+
+def test_existing_class_is_not_repeated():
+    assert rewrite_html('<p class=content-text>a</p>') == '<p class=content-text>a</p>'
+    assert rewrite_html('<p class="x content-text">a</p>') == '<p class="x content-text">a</p>'
@@ -0,0 +1,72 @@
+from seo_tools.similarity import SentenceDeduplicator, merge_blocks
+
+BASE = "Our team builds modern tools that help small companies grow their online presence every single year."
+
+
+def test_exact_duplicate_is_dropped():
+    deduplicator = SentenceDeduplicator()
+    assert deduplicator.add(BASE)
+    assert not deduplicator.add(BASE)
+
+
+def test_punctuation_and_case_variants_are_dropped():
+    deduplicator = SentenceDeduplicator()
+    assert deduplicator.add(BASE)
+    assert not deduplicator.add(BASE.upper().replace(".", "!"))
+    assert not deduplicator.add(BASE.replace("modern tools", "modern, tools").rstrip("."))
+
+
+def test_one_word_edits_are_dropped():
+    words = BASE.rstrip(".").split()
+    for position in range(len(words)):
+        deduplicator = SentenceDeduplicator()
+        assert deduplicator.add(BASE)
+        edited = words[:position] + ["replacement"] + words[position + 1:]
+        assert not deduplicator.add(" ".join(edited) + "."), edited
+
+
+def test_small_paraphrases_are_dropped():
+    pairs = [
+        ("Python is used for web development and data science today.",
+         "Python is used for web development and for data science today."),
+        ("You can build a fast website with this framework in a week.",
+         "You can build a fast site with this framework in a week."),
+    ]
+    for first, second in pairs:
+        deduplicator = SentenceDeduplicator()
+        assert deduplicator.add(first)
+        assert not deduplicator.add(second)
+
+
+def test_different_sentences_are_kept():
+    deduplicator = SentenceDeduplicator()
+    assert deduplicator.add(BASE)
+    assert deduplicator.add("Search engines reward pages that answer questions clearly and quickly.")
+    assert deduplicator.add("Good internal links help readers find related articles on the same site.")
+
+
+def test_merge_blocks_keeps_markup_of_surviving_blocks():
+    current = "<p>Search engines reward pages that answer questions clearly and quickly.</p>"
+    new = (
+        '<h2 class="section-heading">Key Points</h2>\n'
+        '<p class="content-paragraph">Search engines reward pages that answer questions clearly and quickly.</p>\n'
+        '<ul class="feature-list">\n<li class="list-item">Write short, focused paragraphs for readers.</li>\n</ul>\n'
+        '<blockquote class="expert-quote">Content is the reason search began in the first place.</blockquote>\n'
+    )
+    merged, word_count = merge_blocks(current, new)
+
+    assert '<h2 class="section-heading">Key Points</h2>' in merged
+    assert '<li class="list-item">Write short, focused paragraphs for readers.</li>' in merged
+    assert '<blockquote class="expert-quote">' in merged
+    assert "content-paragraph" not in merged
+    assert word_count == len(current.split()) + len(
+        "Key Points Write short, focused paragraphs for readers. "
+        "Content is the reason search began in the first place.".split()
+    )
+
+
+def test_merge_blocks_drops_emptied_lists():
+    current = "<p>Write short, focused paragraphs for readers.</p>"
+    new = '<ul class="feature-list">\n<li class="list-item">Write short, focused paragraphs for readers.</li>\n</ul>\n'
+    merged, _ = merge_blocks(current, new)
+    assert "<ul" not in merged and "<li" not in merged